@@ -1,24 +1,100 @@
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from jose import JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from jwt_codec import create_token_codec
+from metrics import JWT_SECONDS, PASSWORD_HASH_SECONDS
+from workers import BoundedWorkerPool
+import hashlib
+import os
+import secrets
+import threading
+import time
 import uuid
 
 # JWT 설정
 SECRET_KEY = "your-secret-key-change-this-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 1
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+# 이벤트 스트림 티켓 - EventSource 는 헤더를 못 붙이므로 URL 에 담기는 짧은 1회용 토큰
+STREAM_TICKET_EXPIRE_SECONDS = int(os.getenv("STREAM_TICKET_EXPIRE_SECONDS", "30"))
+STREAM_TICKET_PURPOSE = "event-stream"
 ISSUER = "mentor-mentee-app"
 AUDIENCE = "mentor-mentee-users"
+JWT_BACKEND = os.getenv("JWT_BACKEND", "jose")  # jose | fast
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+token_codec = create_token_codec(JWT_BACKEND, SECRET_KEY, ALGORITHM)
+
+# 검증된 토큰 캐시 설정 (크기 0 이면 캐시 사용 안 함)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+# 비밀번호 해시 워커 풀 설정
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", "64"))
+PASSWORD_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_RETRY_AFTER_SECONDS", "1"))
+
+# 비밀번호 해시 설정 - 첫 번째 스킴으로 새 해시를 만들고 나머지는 검증만 (로그인 시 재해시)
+# 비용은 calibrate_password_hash.py 로 서버에 맞게 정한다
+# argon2 스킴은 argon2-cffi 패키지가 필요하다 (requirements.txt 의 passlib[argon2])
+PASSWORD_SCHEMES = [s.strip() for s in os.getenv("PASSWORD_SCHEMES", "bcrypt").split(",") if s.strip()]
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST_KIB = int(os.getenv("ARGON2_MEMORY_COST_KIB", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+def create_password_context(
+    schemes=PASSWORD_SCHEMES,
+    bcrypt_rounds: int = BCRYPT_ROUNDS,
+    argon2_time_cost: int = ARGON2_TIME_COST,
+    argon2_memory_cost_kib: int = ARGON2_MEMORY_COST_KIB,
+    argon2_parallelism: int = ARGON2_PARALLELISM,
+) -> CryptContext:
+    """설정된 스킴/비용의 CryptContext
+
+    기본 스킴이 아니거나 비용이 현재 설정과 다른 해시는 needs_update 가 True
+    """
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost_kib,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+pwd_context = create_password_context()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_SECONDS.time("verify"):
+        return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """비밀번호 검증 -> (일치 여부, 새 해시)
+
+    저장된 해시의 스킴이나 비용이 현재 설정과 다르면 새 설정으로 다시 해시해서
+    돌려준다 (그 외에는 None)
+    """
+    with PASSWORD_HASH_SECONDS.time("verify"):
+        return pwd_context.verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_SECONDS.time("hash"):
+        return pwd_context.hash(password)
+
+# bcrypt는 GIL을 풀고 계산하므로 스레드 풀로 이벤트 루프 밖에서 실행
+password_pool = BoundedWorkerPool(
+    "password", PASSWORD_WORKERS, PASSWORD_QUEUE_LIMIT, PASSWORD_RETRY_AFTER_SECONDS
+)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await password_pool.run(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
 
 def create_access_token(user_data: Dict[str, Any]) -> str:
     """JWT 액세스 토큰 생성"""
@@ -37,13 +113,50 @@ def create_access_token(user_data: Dict[str, Any]) -> str:
         "jti": str(uuid.uuid4())
     })
     
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    with JWT_SECONDS.time("encode"):
+        encoded_jwt = token_codec.encode(to_encode)
     return encoded_jwt
 
+def create_stream_ticket(user_id: int) -> str:
+    """이벤트 스트림 연결용 티켓 (purpose 클레임이 있어 액세스 토큰으로는 쓸 수 없음)"""
+    now = datetime.utcnow()
+    with JWT_SECONDS.time("encode"):
+        return token_codec.encode({
+            "sub": str(user_id),
+            "purpose": STREAM_TICKET_PURPOSE,
+            "iss": ISSUER,
+            "aud": AUDIENCE,
+            "exp": now + timedelta(seconds=STREAM_TICKET_EXPIRE_SECONDS),
+            "nbf": now,
+            "iat": now,
+            "jti": str(uuid.uuid4())
+        })
+
+def verify_stream_ticket(ticket: str) -> dict:
+    payload = verify_token(ticket)
+    if payload.get("purpose") != STREAM_TICKET_PURPOSE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid stream ticket",
+        )
+    return payload
+
+def create_refresh_token() -> Tuple[str, str, float]:
+    """리프레시 토큰 생성 -> (토큰, 저장용 해시, 만료 시각)
+
+    리프레시 토큰은 JWT 가 아닌 임의 문자열이고 서버에는 해시만 저장한다.
+    """
+    token = secrets.token_urlsafe(32)
+    expires_at = time.time() + REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+    return token, hash_refresh_token(token), expires_at
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def verify_token(token: str) -> dict:
     try:
-        # audience 검증 없이 디코딩
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_aud": False})
+        with JWT_SECONDS.time("decode"):
+            payload = token_codec.decode(token)
         return payload
     except JWTError:
         raise HTTPException(
@@ -51,3 +164,72 @@ def verify_token(token: str) -> dict:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+class TokenCache:
+    """검증된 토큰 LRU/TTL 캐시
+
+    키는 토큰 문자열의 SHA-256, 값은 디코딩된 payload.
+    항목은 TTL 과 토큰의 exp 중 빠른 시각에 만료된다.
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE, ttl_seconds: int = TOKEN_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # {토큰 해시: (만료 시각, payload)}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, payload: dict):
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if "exp" in payload:
+            expires_at = min(expires_at, payload["exp"])
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str):
+        """로그아웃/폐기 시 캐시에서 제거"""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+token_cache = TokenCache()
+
+def verify_token_cached(token: str) -> dict:
+    """캐시에 있으면 JWT 디코딩 없이 payload 반환"""
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = verify_token(token)
+        token_cache.put(token, payload)
+    return payload
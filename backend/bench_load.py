@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+API 부하 테스트 - 섞인 작업량으로 엔드포인트별 처리량과 지연 시간 측정
+
+멘토/멘티/매칭 요청을 만든 뒤 동시 작업자들이 정해진 시간 동안 시나리오를
+가중치대로 골라 실행한다. 결과는 엔드포인트별 RPS 와 p50/p95/p99 (ms) 를 담은
+JSON 으로 출력해서 실행마다 비교할 수 있게 한다.
+
+    기본: 프로세스 안에서 ASGI 로 앱 호출 (서버 불필요, 데이터는 저장소에 직접 생성)
+    --url: 실행 중인 서버에 HTTP 로 요청 (데이터도 회원가입 API 로 생성)
+
+시나리오 (--mix 로 가중치 지정):
+    login     로그인 (bcrypt 검증)
+    refresh   리프레시 토큰으로 재발급
+    me        내 정보 조회
+    mentors   멘토 목록 (스킬 필터 / 정렬 / 페이지 크기 무작위)
+    incoming  멘토의 들어온 요청 조회 + 대기 요청 하나 거절
+    outgoing  멘티의 보낸 요청 조회
+    churn     멘티가 요청 생성 후 바로 취소
+
+사용법:
+    python3 bench_load.py --mentors 200 --mentees 1000 --concurrency 32 --duration 10
+    python3 bench_load.py --url http://localhost:8080 --mix login=1,mentors=10 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PASSWORD = "password123"
+SKILLS = ["React", "Vue", "Python", "FastAPI", "Spring Boot", "Kubernetes", "Go", "Rust", "AWS", "Docker"]
+DEFAULT_MIX = "login=1,refresh=1,me=4,mentors=8,incoming=3,outgoing=3,churn=2"
+
+
+def percentile(values, pct):
+    """정렬된 리스트에서 백분위 값 계산"""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def parse_mix(mix):
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"알 수 없는 시나리오: {name}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+class Recorder:
+    """엔드포인트 라벨별 지연 시간(초)과 상태 코드 수집"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+
+    async def call(self, client, method, url, label, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            code = str(response.status_code)
+        except httpx.HTTPError:
+            response = None
+            code = "error"
+        self.latencies.setdefault(label, []).append(time.perf_counter() - started)
+        counts = self.statuses.setdefault(label, {})
+        counts[code] = counts.get(code, 0) + 1
+        return response
+
+    def report(self, elapsed):
+        endpoints = {}
+        for label in sorted(self.latencies):
+            values = sorted(self.latencies[label])
+            endpoints[label] = {
+                "requests": len(values),
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+                "status": self.statuses[label],
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        return {"total_requests": total, "total_rps": round(total / elapsed, 2), "endpoints": endpoints}
+
+
+class LoadContext:
+    """시드 데이터와 세션 (토큰)"""
+
+    def __init__(self):
+        self.mentor_ids = []
+        self.mentees = []  # [(id, email)]
+        self.emails = []
+        self.mentor_tokens = {}  # {mentor_id: token}
+        self.mentee_tokens = {}  # {mentee_id: token}
+        self.refresh_tokens = {}  # {작업자 번호: 리프레시 토큰} - 작업자마다 따로 써야 재사용 탐지에 걸리지 않음
+
+
+def auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def mentor_profile(rng, name):
+    return {
+        "name": name,
+        "bio": "",
+        "imageUrl": "https://placehold.co/500x500.jpg?text=MENTOR",
+        "skills": rng.sample(SKILLS, rng.randint(1, 3)),
+    }
+
+
+def seed_direct(ctx, args, rng, workers):
+    """저장소에 직접 적재 (seed_data) - 비밀번호 해시는 한 번만 계산"""
+    import main
+    from auth import create_access_token, create_refresh_token
+    from seed_data import seed_repository
+
+    users = args.mentors + args.mentees
+    seeded = seed_repository(
+        main.repo.sync,
+        password=PASSWORD,
+        users=users,
+        mentor_ratio=args.mentors / users,
+        fanout=args.requests_per_mentee,
+        status_weights={"pending": 1},
+        seed=args.seed,
+    )
+    for user_id, (email, _, name, role, _) in zip(seeded["user_ids"], seeded["users"]):
+        ctx.emails.append(email)
+        token = create_access_token(main.access_token_data({"id": user_id, "email": email, "name": name, "role": role}))
+        if role == "mentor":
+            ctx.mentor_ids.append(user_id)
+            ctx.mentor_tokens[user_id] = token
+        else:
+            ctx.mentees.append((user_id, email))
+            ctx.mentee_tokens[user_id] = token
+    for worker in range(workers):
+        mentee_id, _ = rng.choice(ctx.mentees)
+        token, token_hash, expires_at = create_refresh_token()
+        main.repo.sync.save_refresh_token(token_hash, f"load-{worker}", mentee_id, expires_at)
+        ctx.refresh_tokens[worker] = token
+
+
+async def seed_http(ctx, client, args, rng, workers):
+    """회원가입/로그인 API 로 생성 (서버에서 사용자마다 bcrypt 실행)"""
+    run_id = int(time.time())
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def signup_and_login(email, name, role):
+        async with semaphore:
+            await client.post("/api/signup", json={"email": email, "password": PASSWORD, "name": name, "role": role})
+            response = await client.post("/api/login", json={"email": email, "password": PASSWORD})
+            response.raise_for_status()
+            token = response.json()["token"]
+            me = (await client.get("/api/me", headers=auth(token))).json()
+            return me["id"], token, response.json()["refreshToken"]
+
+    mentors = await asyncio.gather(*(
+        signup_and_login(f"load_mentor{run_id}_{i}@example.com", f"멘토{i}", "mentor") for i in range(args.mentors)
+    ))
+    for i, (mentor_id, token, _) in enumerate(mentors):
+        ctx.mentor_ids.append(mentor_id)
+        ctx.mentor_tokens[mentor_id] = token
+        ctx.emails.append(f"load_mentor{run_id}_{i}@example.com")
+        profile = mentor_profile(rng, f"멘토{i}")
+        await client.put("/api/profile", headers=auth(token), json={
+            "name": profile["name"], "bio": profile["bio"], "skills": profile["skills"]
+        })
+    mentees = await asyncio.gather(*(
+        signup_and_login(f"load_mentee{run_id}_{i}@example.com", f"멘티{i}", "mentee") for i in range(args.mentees)
+    ))
+    for i, (mentee_id, token, _) in enumerate(mentees):
+        email = f"load_mentee{run_id}_{i}@example.com"
+        ctx.mentees.append((mentee_id, email))
+        ctx.emails.append(email)
+        ctx.mentee_tokens[mentee_id] = token
+        for mentor_id in rng.sample(ctx.mentor_ids, min(args.requests_per_mentee, len(ctx.mentor_ids))):
+            await client.post("/api/match-requests", headers=auth(token), json={
+                "mentorId": mentor_id, "menteeId": mentee_id, "message": "멘토링 부탁드립니다"
+            })
+    for worker in range(workers):
+        _, email = rng.choice(ctx.mentees)
+        response = await client.post("/api/login", json={"email": email, "password": PASSWORD})
+        ctx.refresh_tokens[worker] = response.json()["refreshToken"]
+
+
+async def scenario_login(ctx, client, rec, rng, worker):
+    email = rng.choice(ctx.emails)
+    await rec.call(client, "POST", "/api/login", "POST /api/login", json={"email": email, "password": PASSWORD})
+
+
+async def scenario_refresh(ctx, client, rec, rng, worker):
+    response = await rec.call(
+        client, "POST", "/api/token/refresh", "POST /api/token/refresh",
+        json={"refreshToken": ctx.refresh_tokens[worker]}
+    )
+    if response is not None and response.status_code == 200:
+        ctx.refresh_tokens[worker] = response.json()["refreshToken"]
+
+
+async def scenario_me(ctx, client, rec, rng, worker):
+    mentee_id, _ = rng.choice(ctx.mentees)
+    await rec.call(client, "GET", "/api/me", "GET /api/me", headers=auth(ctx.mentee_tokens[mentee_id]))
+
+
+async def scenario_mentors(ctx, client, rec, rng, worker):
+    mentee_id, _ = rng.choice(ctx.mentees)
+    params = {}
+    if rng.random() < 0.5:
+        params["skill"] = rng.choice(SKILLS)
+    if rng.random() < 0.5:
+        params["order_by"] = rng.choice(("name", "skill"))
+    if rng.random() < 0.7:
+        params["limit"] = rng.choice((20, 50, 100))
+    await rec.call(
+        client, "GET", "/api/mentors", "GET /api/mentors",
+        headers=auth(ctx.mentee_tokens[mentee_id]), params=params
+    )
+
+
+async def scenario_incoming(ctx, client, rec, rng, worker):
+    mentor_id = rng.choice(ctx.mentor_ids)
+    headers = auth(ctx.mentor_tokens[mentor_id])
+    response = await rec.call(
+        client, "GET", "/api/match-requests/incoming", "GET /api/match-requests/incoming", headers=headers
+    )
+    if response is None or response.status_code != 200:
+        return
+    pending = [r["id"] for r in response.json() if r["status"] == "pending"]
+    if pending:
+        await rec.call(
+            client, "PUT", f"/api/match-requests/{rng.choice(pending)}/reject",
+            "PUT /api/match-requests/{id}/reject", headers=headers
+        )
+
+
+async def scenario_outgoing(ctx, client, rec, rng, worker):
+    mentee_id, _ = rng.choice(ctx.mentees)
+    await rec.call(
+        client, "GET", "/api/match-requests/outgoing", "GET /api/match-requests/outgoing",
+        headers=auth(ctx.mentee_tokens[mentee_id])
+    )
+
+
+async def scenario_churn(ctx, client, rec, rng, worker):
+    mentee_id, _ = rng.choice(ctx.mentees)
+    headers = auth(ctx.mentee_tokens[mentee_id])
+    response = await rec.call(
+        client, "POST", "/api/match-requests", "POST /api/match-requests", headers=headers,
+        json={"mentorId": rng.choice(ctx.mentor_ids), "menteeId": mentee_id, "message": "부하 테스트 요청"}
+    )
+    if response is not None and response.status_code == 200:
+        await rec.call(
+            client, "DELETE", f"/api/match-requests/{response.json()['id']}",
+            "DELETE /api/match-requests/{id}", headers=headers
+        )
+
+
+SCENARIOS = {
+    "login": scenario_login,
+    "refresh": scenario_refresh,
+    "me": scenario_me,
+    "mentors": scenario_mentors,
+    "incoming": scenario_incoming,
+    "outgoing": scenario_outgoing,
+    "churn": scenario_churn,
+}
+
+
+async def run(args):
+    weights = parse_mix(args.mix)
+    names = list(weights)
+    rng = random.Random(args.seed)
+    ctx = LoadContext()
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        import main
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=main.app), base_url="http://bench", timeout=args.timeout
+        )
+
+    async with client:
+        seed_started = time.perf_counter()
+        if args.url:
+            await seed_http(ctx, client, args, rng, args.concurrency)
+        else:
+            seed_direct(ctx, args, rng, args.concurrency)
+        seed_seconds = time.perf_counter() - seed_started
+
+        rec = Recorder()
+        deadline = time.perf_counter() + args.duration
+
+        async def worker(worker_id):
+            worker_rng = random.Random(args.seed * 1000 + worker_id)
+            while time.perf_counter() < deadline:
+                scenario = worker_rng.choices(names, weights=[weights[n] for n in names])[0]
+                await SCENARIOS[scenario](ctx, client, rec, worker_rng, worker_id)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "config": {
+            "target": args.url or "in-process",
+            "storage_backend": os.getenv("STORAGE_BACKEND", "memory") if not args.url else None,
+            "mentors": args.mentors,
+            "mentees": args.mentees,
+            "requests_per_mentee": args.requests_per_mentee,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "mix": weights,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "seed_seconds": round(seed_seconds, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        **rec.report(elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 부하 테스트")
+    parser.add_argument("--url", help="실행 중인 서버 주소 (없으면 프로세스 안에서 실행)")
+    parser.add_argument("--mentors", type=int, default=100)
+    parser.add_argument("--mentees", type=int, default=500)
+    parser.add_argument("--requests-per-mentee", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10, help="측정 시간 (초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="시나리오=가중치 목록")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", help="결과 JSON 파일 (없으면 표준 출력)")
+    args = parser.parse_args()
+
+    result = json.dumps(asyncio.run(run(args)), indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(result)
+    else:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+로그인 폭주 중 /api/me 지연 시간 벤치마크
+
+로그인 요청으로 서버를 포화시킨 상태에서 /api/me 응답 시간의
+p50/p95/p99 를 측정한다. 서버는 미리 실행되어 있어야 한다 (run_server.py).
+
+사용법:
+    python3 bench_password_pool.py --login-threads 32 --me-threads 4 --duration 10
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://localhost:8080"
+API_BASE_URL = f"{BASE_URL}/api"
+
+
+def percentile(values, pct):
+    """정렬된 리스트에서 백분위 값 계산"""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def create_account():
+    """벤치마크용 계정 생성 후 토큰 반환"""
+    email = f"bench_{uuid.uuid4().hex[:12]}@example.com"
+    password = "password123"
+    requests.post(f"{API_BASE_URL}/signup", json={
+        "email": email,
+        "password": password,
+        "name": "벤치마크",
+        "role": "mentee"
+    }, timeout=30)
+    response = requests.post(f"{API_BASE_URL}/login", json={
+        "email": email,
+        "password": password
+    }, timeout=30)
+    response.raise_for_status()
+    return email, password, response.json()["token"]
+
+
+def login_worker(email, password, stop_event, stats):
+    """정지 신호가 올 때까지 로그인 반복"""
+    session = requests.Session()
+    while not stop_event.is_set():
+        try:
+            response = session.post(f"{API_BASE_URL}/login", json={
+                "email": email,
+                "password": password
+            }, timeout=30)
+            key = f"login_{response.status_code}"
+        except requests.RequestException:
+            key = "login_error"
+        with stats["lock"]:
+            stats[key] = stats.get(key, 0) + 1
+
+
+def me_worker(token, stop_event, latencies, lock):
+    """정지 신호가 올 때까지 /api/me 지연 시간 측정"""
+    session = requests.Session()
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop_event.is_set():
+        started = time.perf_counter()
+        try:
+            session.get(f"{API_BASE_URL}/me", headers=headers, timeout=30)
+        except requests.RequestException:
+            continue
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed_ms)
+
+
+def run_phase(token, email, password, login_threads, me_threads, duration):
+    """로그인 스레드 수를 지정해서 한 구간 측정"""
+    stop_event = threading.Event()
+    latencies = []
+    lock = threading.Lock()
+    stats = {"lock": threading.Lock()}
+
+    with ThreadPoolExecutor(max_workers=login_threads + me_threads) as executor:
+        for _ in range(login_threads):
+            executor.submit(login_worker, email, password, stop_event, stats)
+        for _ in range(me_threads):
+            executor.submit(me_worker, token, stop_event, latencies, lock)
+        time.sleep(duration)
+        stop_event.set()
+
+    latencies.sort()
+    stats.pop("lock")
+    return {
+        "login_threads": login_threads,
+        "me_requests": len(latencies),
+        "me_p50_ms": percentile(latencies, 50),
+        "me_p95_ms": percentile(latencies, 95),
+        "me_p99_ms": percentile(latencies, 99),
+        "me_max_ms": latencies[-1] if latencies else None,
+        "logins": stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 /api/me 지연 시간 측정")
+    parser.add_argument("--login-threads", type=int, default=32)
+    parser.add_argument("--me-threads", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    email, password, token = create_account()
+
+    print("📊 기준선 측정 (로그인 부하 없음)...")
+    baseline = run_phase(token, email, password, 0, args.me_threads, args.duration)
+    print(f"📊 로그인 폭주 측정 (로그인 스레드 {args.login_threads}개)...")
+    loaded = run_phase(token, email, password, args.login_threads, args.me_threads, args.duration)
+
+    print(json.dumps({"baseline": baseline, "login_storm": loaded}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
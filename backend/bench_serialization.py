@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+목록 응답 직렬화 벤치마크 - FastAPI 기본 경로 / FastJSONResponse 비교
+
+기본 경로: (pydantic 모델 생성) -> jsonable_encoder -> JSONResponse
+빠른 경로: dict 목록 -> FastJSONResponse (orjson 이 있으면 orjson)
+
+사용법:
+    python3 bench_serialization.py --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from models import MatchRequestResponse  # noqa: E402
+from responses import FastJSONResponse, orjson  # noqa: E402
+
+SKILLS = ["React", "Vue", "Python", "FastAPI", "Spring Boot", "Kubernetes", "Go", "Rust"]
+
+
+def make_mentors(count):
+    return [
+        {
+            "id": i,
+            "email": f"mentor{i}@example.com",
+            "role": "mentor",
+            "profile": {
+                "name": f"멘토{i}",
+                "bio": "10년차 백엔드 개발자입니다. 코드 리뷰와 설계 상담을 도와드려요.",
+                "imageUrl": f"/api/images/mentor/{i}",
+                "skills": [SKILLS[i % len(SKILLS)], SKILLS[(i * 3) % len(SKILLS)]],
+            },
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_requests(count):
+    return [
+        {"id": i, "mentorId": 1, "menteeId": i + 1, "message": "멘토링 부탁드립니다!", "status": "pending"}
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(func, iterations):
+    best = float("inf")
+    for _ in range(iterations):
+        started = time.perf_counter()
+        body = func()
+        best = min(best, time.perf_counter() - started)
+    return {"ms": round(best * 1000, 3), "bytes": len(body)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목록 응답 직렬화 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=5, help="크기별 반복 횟수 (가장 빠른 값 사용)")
+    args = parser.parse_args()
+
+    results = {"orjson": orjson is not None, "mentors": {}, "match_requests": {}}
+    for size in args.sizes:
+        mentors = make_mentors(size)
+        default = measure(lambda: JSONResponse(jsonable_encoder(mentors)).body, args.iterations)
+        fast = measure(lambda: FastJSONResponse(mentors).body, args.iterations)
+        results["mentors"][size] = {"default": default, "fast": fast, "speedup": round(default["ms"] / fast["ms"], 2)}
+
+        requests = make_requests(size)
+        default = measure(
+            lambda: JSONResponse(jsonable_encoder([MatchRequestResponse(**r) for r in requests])).body,
+            args.iterations,
+        )
+        fast = measure(lambda: FastJSONResponse(requests).body, args.iterations)
+        results["match_requests"][size] = {
+            "default": default, "fast": fast, "speedup": round(default["ms"] / fast["ms"], 2)
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+인증 비용 마이크로벤치마크 - 토큰 캐시 사용 / 미사용 비교
+
+get_current_user 와 같은 경로 (토큰 검증 + 사용자 조회) 의
+요청당 비용을 서버 없이 프로세스 안에서 측정한다.
+
+사용법:
+    python3 bench_token_cache.py --iterations 100000 --tokens 100
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import auth  # noqa: E402
+from auth import TokenCache, create_access_token, verify_token_cached  # noqa: E402
+
+
+def authenticate(token, users):
+    """get_current_user 와 같은 함수로 검증 + 조회"""
+    payload = verify_token_cached(token)
+    return users[int(payload["sub"])]
+
+
+def run(tokens, users, iterations, cache_size):
+    """auth.token_cache 를 cache_size 크기로 바꿔 측정 (0 이면 TOKEN_CACHE_SIZE=0 과 같음)"""
+    auth.token_cache = TokenCache(max_size=cache_size)
+    started = time.perf_counter()
+    for i in range(iterations):
+        authenticate(tokens[i % len(tokens)], users)
+    elapsed = time.perf_counter() - started
+    return {
+        "iterations": iterations,
+        "total_seconds": elapsed,
+        "per_request_us": elapsed / iterations * 1_000_000,
+        "requests_per_second": iterations / elapsed,
+        "cache": auth.token_cache.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="토큰 캐시 마이크로벤치마크")
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--tokens", type=int, default=100, help="동시에 사용 중인 세션(토큰) 수")
+    args = parser.parse_args()
+
+    users = {}
+    tokens = []
+    for user_id in range(1, args.tokens + 1):
+        users[user_id] = {"id": user_id, "email": f"user{user_id}@example.com", "role": "mentee"}
+        tokens.append(create_access_token({
+            "sub": str(user_id),
+            "email": users[user_id]["email"],
+            "name": f"사용자{user_id}",
+            "role": "mentee"
+        }))
+
+    without_cache = run(tokens, users, args.iterations, 0)
+    with_cache = run(tokens, users, args.iterations, max(args.tokens, 1))
+
+    print(json.dumps({
+        "without_cache": without_cache,
+        "with_cache": with_cache,
+        "speedup": without_cache["per_request_us"] / with_cache["per_request_us"],
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
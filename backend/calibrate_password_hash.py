@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+비밀번호 해시 비용 보정 - 이 서버에서 검증 1회가 목표 시간에 가장 가깝게 걸리는 비용 찾기
+
+bcrypt 는 rounds 를, argon2 는 메모리를 고정하고 time_cost 를 올려 가며 측정한다.
+목표 시간을 넘지 않는 가장 높은 비용을 고르고, 그대로 쓸 수 있는 환경변수를 출력한다.
+
+사용법:
+    python3 calibrate_password_hash.py --target-ms 250
+    python3 calibrate_password_hash.py --scheme argon2 --memory-kib 65536 --target-ms 250
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from auth import ARGON2_MEMORY_COST_KIB, ARGON2_PARALLELISM, create_password_context  # noqa: E402
+
+BCRYPT_ROUNDS_RANGE = range(8, 18)
+ARGON2_TIME_COST_RANGE = range(1, 11)
+PASSWORD = "calibration-password"
+
+
+def verify_ms(context, samples):
+    """같은 해시를 samples 번 검증했을 때 가장 빠른 시간 (ms)"""
+    hashed = context.hash(PASSWORD)
+    best = float("inf")
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(PASSWORD, hashed)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def calibrate(candidates, target_ms, samples):
+    """비용이 오르는 순서의 [(비용, context)] 에서 목표 이하인 가장 높은 비용 선택"""
+    measurements = []
+    chosen = None
+    for cost, context in candidates:
+        elapsed_ms = verify_ms(context, samples)
+        measurements.append({"cost": cost, "verify_ms": round(elapsed_ms, 2)})
+        if elapsed_ms > target_ms:
+            break
+        chosen = cost
+    # 가장 낮은 비용도 목표를 넘으면 가장 낮은 비용 사용
+    if chosen is None:
+        chosen = measurements[0]["cost"]
+    return chosen, measurements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비밀번호 해시 비용 보정")
+    parser.add_argument("--scheme", choices=("bcrypt", "argon2"), default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250, help="검증 1회 목표 시간 (ms)")
+    parser.add_argument("--samples", type=int, default=3, help="비용별 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--memory-kib", type=int, default=ARGON2_MEMORY_COST_KIB, help="argon2 메모리 (KiB)")
+    parser.add_argument("--parallelism", type=int, default=ARGON2_PARALLELISM, help="argon2 병렬도")
+    args = parser.parse_args()
+
+    if args.scheme == "bcrypt":
+        candidates = (
+            (rounds, create_password_context(["bcrypt"], bcrypt_rounds=rounds))
+            for rounds in BCRYPT_ROUNDS_RANGE
+        )
+        rounds, measurements = calibrate(candidates, args.target_ms, args.samples)
+        env = {"PASSWORD_SCHEMES": "bcrypt", "BCRYPT_ROUNDS": str(rounds)}
+    else:
+        try:
+            import argon2  # noqa: F401
+        except ImportError:
+            sys.exit("argon2 스킴에는 argon2-cffi 패키지가 필요합니다: pip install argon2-cffi")
+        candidates = (
+            (time_cost, create_password_context(
+                ["argon2"],
+                argon2_time_cost=time_cost,
+                argon2_memory_cost_kib=args.memory_kib,
+                argon2_parallelism=args.parallelism,
+            ))
+            for time_cost in ARGON2_TIME_COST_RANGE
+        )
+        time_cost, measurements = calibrate(candidates, args.target_ms, args.samples)
+        # 기존 bcrypt 해시는 계속 검증되고 로그인 시 argon2 로 재해시됨
+        env = {
+            "PASSWORD_SCHEMES": "argon2,bcrypt",
+            "ARGON2_TIME_COST": str(time_cost),
+            "ARGON2_MEMORY_COST_KIB": str(args.memory_kib),
+            "ARGON2_PARALLELISM": str(args.parallelism),
+        }
+
+    print(json.dumps({
+        "scheme": args.scheme,
+        "target_ms": args.target_ms,
+        "measurements": measurements,
+        "env": env,
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Server-Sent Events 허브 - 매칭 요청 변경을 관련 멘토/멘티에게 전달
+
+구독자마다 크기가 정해진 큐를 두고, 큐가 가득 찬 (읽지 못하는) 구독자는
+연결을 끊는다. 끊긴 클라이언트는 다시 연결해서 목록을 새로 받으면 된다.
+허브는 프로세스 안에서만 동작하므로, 여러 워커가 같은 저장소를 쓰면 ChangeFeed 가
+저장소의 변경을 version 순으로 읽어서 다른 워커가 처리한 변경도 허브로 전달한다.
+"""
+from typing import Callable, Iterable, List
+import asyncio
+import json
+import logging
+import os
+
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+EVENT_KEEPALIVE_SECONDS = float(os.getenv("EVENT_KEEPALIVE_SECONDS", "15"))
+# 연결이 끊겼을 때 브라우저 EventSource 가 다시 연결하기까지 기다리는 시간
+EVENT_RETRY_MS = int(os.getenv("EVENT_RETRY_MS", "3000"))
+# 다른 워커가 처리한 변경을 저장소에서 읽는 주기
+EVENT_FEED_INTERVAL_MS = int(os.getenv("EVENT_FEED_INTERVAL_MS", "250"))
+
+KEEPALIVE_MESSAGE = b": keepalive\n\n"
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event: str, data: dict) -> bytes:
+    """SSE 메시지 한 개 (data 는 한 줄 JSON)"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class Subscriber:
+    def __init__(self, user_id: int, queue_size: int):
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+class EventHub:
+    """user_id 별 구독자 목록 + 발행 시 메시지를 한 번만 인코딩해서 나눠 줌
+
+    이벤트 루프 스레드에서만 사용한다.
+    """
+
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.dropped_count = 0
+        self._subscribers = {}  # {user_id: set(Subscriber)}
+
+    def subscribe(self, user_id: int) -> Subscriber:
+        subscriber = Subscriber(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscribers = self._subscribers.get(subscriber.user_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[subscriber.user_id]
+
+    def publish(self, user_ids: Iterable[int], event: str, data: dict):
+        message = format_event(event, data)
+        for user_id in set(user_ids):
+            for subscriber in list(self._subscribers.get(user_id, ())):
+                try:
+                    subscriber.queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    # 느린 구독자 하나 때문에 발행이 막히거나 메모리가 늘지 않도록 끊음
+                    subscriber.dropped = True
+                    self.dropped_count += 1
+                    self.unsubscribe(subscriber)
+
+    async def stream(self, user_id: int, keepalive_seconds: float = EVENT_KEEPALIVE_SECONDS):
+        """user_id 구독을 SSE 바이트 스트림으로
+
+        구독은 응답이 스트림을 읽기 시작할 때 만들고 끝나면 해제한다. 응답이 시작되기
+        전에 클라이언트가 끊으면 구독 자체가 생기지 않는다.
+        """
+        subscriber = self.subscribe(user_id)
+        try:
+            yield f"retry: {EVENT_RETRY_MS}\n\n".encode("ascii")
+            while not subscriber.dropped:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), keepalive_seconds)
+                except asyncio.TimeoutError:
+                    message = KEEPALIVE_MESSAGE
+                if subscriber.dropped:
+                    break
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "dropped": self.dropped_count,
+        }
+
+
+class ChangeFeed:
+    """저장소의 요청 변경을 주기적으로 읽어 이 프로세스의 허브로 발행
+
+    version 이 마지막으로 본 값보다 큰 요청을 interval 마다 읽어 publish 로 넘긴다.
+    이 프로세스가 처리하면서 바로 발행한 변경 (mark_published) 은 건너뛰므로 같은
+    워커의 구독자는 기다리지 않고, 다른 워커의 구독자는 최대 interval 뒤에 받는다.
+    구독자가 없을 때는 목록 대신 최고 version 만 읽는다.
+    """
+
+    def __init__(self, repo, hub: EventHub, publish: Callable[[List[dict]], None],
+                 interval_seconds: float = EVENT_FEED_INTERVAL_MS / 1000):
+        self.repo = repo  # AsyncRepository
+        self.hub = hub
+        self.publish = publish
+        self.interval_seconds = interval_seconds
+        self.version = 0
+        self._published = set()  # {(request_id, version)} 이미 발행했고 아직 읽지 않은 변경
+        self._task = None
+
+    def mark_published(self, changed: List[dict]):
+        for request_data in changed:
+            if request_data["version"] > self.version:
+                self._published.add((request_data["id"], request_data["version"]))
+
+    async def poll(self):
+        if self.hub.has_subscribers():
+            changed = await self.repo.list_request_changes(self.version)
+            fresh = [r for r in changed if (r["id"], r["version"]) not in self._published]
+            if changed:
+                self.version = changed[-1]["version"]
+        else:
+            fresh = []
+            self.version = max(self.version, await self.repo.get_request_version())
+        self._published = {key for key in self._published if key[1] > self.version}
+        if fresh:
+            self.publish(fresh)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.poll()
+            except Exception:
+                # 저장소 오류 (잠금 대기 시간 초과 등) 는 다음 주기에 다시 시도
+                logger.exception("Change feed poll failed")
+
+    async def start(self):
+        if self._task is None:
+            self.version = await self.repo.get_request_version()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,273 @@
+"""
+프로필 이미지 처리 - 업로드 시 한 번만 디코딩/검증/재인코딩하고 바이트로 보관
+"""
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+from PIL import Image, ImageOps, UnidentifiedImageError
+from python_multipart.exceptions import FormParserError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from workers import BoundedWorkerPool
+import base64
+import binascii
+import hashlib
+import os
+import threading
+
+# 요구사항: 정사각형, 500x500 ~ 1000x1000, 1MB 이하
+IMAGE_MAX_BYTES = 1024 * 1024
+IMAGE_MIN_DIMENSION = 500
+IMAGE_MAX_DIMENSION = 1000
+# multipart 파트 하나의 헤더 (Content-Disposition 등) 최대 크기
+MULTIPART_HEADER_MAX_BYTES = 16 * 1024
+THUMBNAIL_SIZES = (64, 128)
+IMAGE_OUTPUT_FORMAT = os.getenv("IMAGE_OUTPUT_FORMAT", "JPEG")  # JPEG | WEBP
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "85"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+IMAGE_QUEUE_LIMIT = int(os.getenv("IMAGE_QUEUE_LIMIT", "16"))
+
+OUTPUT_MEDIA_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# 이미지 URL 은 바뀌지 않고 내용만 바뀌므로 기본값은 매번 재검증 (304 응답)
+IMAGE_CACHE_CONTROL = os.getenv("IMAGE_CACHE_CONTROL", "private, no-cache")
+
+# 파일 시그니처 -> MIME 타입
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+)
+
+
+class InvalidImageError(ValueError):
+    pass
+
+
+class ImageTooLargeError(InvalidImageError):
+    pass
+
+
+def detect_media_type(data: bytes) -> str:
+    for signature, media_type in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return media_type
+    raise InvalidImageError("Unsupported image format")
+
+
+def decode_base64_image(image: str) -> Tuple[bytes, str]:
+    """Base64 이미지 문자열 디코딩 + 형식 검증 -> (바이트, MIME 타입)"""
+    # data:image/jpeg;base64,... 형태도 허용
+    if image.startswith("data:") and "," in image:
+        image = image.split(",", 1)[1]
+    try:
+        data = base64.b64decode(image, validate=True)
+    except (binascii.Error, ValueError):
+        raise InvalidImageError("Invalid base64 image")
+    return data, detect_media_type(data)
+
+
+def image_digest(data: bytes) -> str:
+    """이미지 내용 해시 - 저장 키이자 강한 ETag 로 사용"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _encode_image(img: Image.Image) -> dict:
+    buffer = BytesIO()
+    img.save(buffer, format=IMAGE_OUTPUT_FORMAT, quality=IMAGE_QUALITY, optimize=True)
+    data = buffer.getvalue()
+    return {"digest": image_digest(data), "media_type": OUTPUT_MEDIA_TYPES[IMAGE_OUTPUT_FORMAT], "data": data}
+
+
+def normalize_image(data: bytes) -> Dict[str, dict]:
+    """크기 검증 + 메타데이터 제거 + 재인코딩 + 썸네일 생성
+
+    반환값: {"original": 이미지, "64": 이미지, "128": 이미지}
+    이미지는 {"digest", "media_type", "data"}
+    """
+    if len(data) > IMAGE_MAX_BYTES:
+        raise ImageTooLargeError("Image must be 1MB or smaller")
+    detect_media_type(data)
+
+    try:
+        with Image.open(BytesIO(data)) as img:
+            # 픽셀을 풀기 전에 헤더의 크기로 먼저 검증
+            width, height = img.size
+            if width != height:
+                raise InvalidImageError("Image must be square")
+            if not IMAGE_MIN_DIMENSION <= width <= IMAGE_MAX_DIMENSION:
+                raise InvalidImageError(
+                    f"Image must be between {IMAGE_MIN_DIMENSION}x{IMAGE_MIN_DIMENSION} "
+                    f"and {IMAGE_MAX_DIMENSION}x{IMAGE_MAX_DIMENSION}"
+                )
+            # EXIF 회전을 반영한 뒤 다시 인코딩
+            img = ImageOps.exif_transpose(img)
+            if img.mode != "RGB":
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                rgba = img.convert("RGBA")
+                background.paste(rgba, mask=rgba.getchannel("A"))
+                img = background
+            # 복사본도 img.info (JPEG 주석, EXIF, XMP 등) 를 그대로 들고 있고 인코더가
+            # 이를 다시 기록하므로 색 변환에 필요한 ICC 프로필만 남기고 비움
+            img.info = {key: value for key, value in img.info.items() if key == "icc_profile"}
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise InvalidImageError("Invalid image")
+
+    variants = {"original": _encode_image(img)}
+    for size in THUMBNAIL_SIZES:
+        variants[str(size)] = _encode_image(img.resize((size, size), Image.LANCZOS))
+    return variants
+
+
+def decode_and_normalize_image(image: str) -> Dict[str, dict]:
+    data, _ = decode_base64_image(image)
+    return normalize_image(data)
+
+
+image_pool = BoundedWorkerPool("image", IMAGE_WORKERS, IMAGE_QUEUE_LIMIT, 1)
+
+
+async def normalize_image_async(image: str) -> Dict[str, dict]:
+    """Base64 이미지 디코딩 + 정규화를 워커 풀에서 실행"""
+    return await image_pool.run(decode_and_normalize_image, image)
+
+
+async def normalize_image_bytes_async(data: bytes) -> Dict[str, dict]:
+    return await image_pool.run(normalize_image, data)
+
+
+async def read_multipart_file(request, field_name: str, max_bytes: int = IMAGE_MAX_BYTES) -> bytes:
+    """multipart/form-data 본문을 청크 단위로 읽어 field_name 파일만 추출
+
+    본문 전체를 메모리나 임시 파일에 모으지 않고, 파일 내용이
+    max_bytes 를 넘는 순간 읽기를 멈추고 ImageTooLargeError 를 던진다.
+    파트 헤더가 MULTIPART_HEADER_MAX_BYTES 를 넘으면 InvalidImageError
+    (python-multipart 버전에 따라 자체 제한이 없으므로 직접 확인).
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise InvalidImageError("Expected multipart/form-data")
+
+    target = field_name.encode()
+    buffer = bytearray()
+    state = {"field": b"", "value": b"", "headers": {}, "header_bytes": 0, "capturing": False, "found": False}
+
+    def count_header_bytes(size):
+        state["header_bytes"] += size
+        if state["header_bytes"] > MULTIPART_HEADER_MAX_BYTES:
+            raise InvalidImageError("Multipart part headers too large")
+
+    def on_part_begin():
+        state["headers"] = {}
+        state["header_bytes"] = 0
+
+    def on_header_field(data, start, end):
+        count_header_bytes(end - start)
+        state["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        count_header_bytes(end - start)
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["field"].lower()] = state["value"]
+        state["field"] = b""
+        state["value"] = b""
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        state["capturing"] = not state["found"] and disposition.get(b"name") == target
+
+    def on_part_data(data, start, end):
+        if state["capturing"]:
+            if len(buffer) + (end - start) > max_bytes:
+                raise ImageTooLargeError("Image must be 1MB or smaller")
+            buffer.extend(data[start:end])
+
+    def on_part_end():
+        if state["capturing"]:
+            state["capturing"] = False
+            state["found"] = True
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except FormParserError:
+        # 경계 문자열 누락, 잘못된 헤더 줄 등 형식이 깨진 본문
+        raise InvalidImageError("Malformed multipart body")
+
+    if not state["found"]:
+        raise InvalidImageError(f"Missing '{field_name}' file field")
+    return bytes(buffer)
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더 비교 (약한 비교 - RFC 7232 3.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified_since(if_modified_since: str, updated_at: float) -> bool:
+    """If-Modified-Since 이후 변경이 없으면 True (HTTP 날짜는 초 단위)"""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError, IndexError):
+        return False
+    if since is None:
+        return False
+    return int(updated_at) <= since.timestamp()
+
+
+class ImageCache:
+    """내용 해시 -> 이미지 바이트 LRU 캐시 (총 바이트 수로 제한)
+
+    키가 내용 해시라서 값이 바뀌는 일이 없으므로 무효화가 필요 없다.
+    """
+
+    def __init__(self, max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(digest)
+            if data is not None:
+                self._entries.move_to_end(digest)
+            return data
+
+    def put(self, digest: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                return
+            self._entries[digest] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
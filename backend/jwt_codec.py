@@ -0,0 +1,139 @@
+"""
+JWT 인코딩/디코딩 백엔드
+
+JWT_BACKEND 환경변수로 선택한다.
+    jose (기본값): python-jose 사용 (호환성 우선)
+    fast: HS256 전용 구현 - HMAC 키와 인코딩된 헤더를 미리 계산해 두고 재사용
+두 구현이 만든 토큰은 서로 호환된다.
+"""
+from calendar import timegm
+from datetime import datetime
+from typing import Any, Dict
+from jose import JWTError, jwt
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 사용
+    orjson = None
+
+# jose 와 같은 방식으로 숫자 타임스탬프로 바꾸는 시간 클레임
+TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class JoseTokenCodec:
+    """python-jose 기반 구현"""
+
+    def __init__(self, secret_key: str, algorithm: str):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        # audience 검증 없이 디코딩
+        return jwt.decode(token, self.secret_key, algorithms=[self.algorithm], options={"verify_aud": False})
+
+
+class FastHMACTokenCodec:
+    """HS256 전용 구현
+
+    - HMAC 키 스케줄을 한 번만 계산하고 요청마다 copy() 로 재사용
+    - 헤더는 항상 같으므로 인코딩 결과를 캐시
+    - 클레임 JSON 은 orjson 이 있으면 orjson 으로 처리
+    검증 실패 시 jose 와 같은 JWTError 를 던진다.
+    """
+
+    ALGORITHM = "HS256"
+
+    def __init__(self, secret_key: str, algorithm: str = ALGORITHM):
+        if algorithm != self.ALGORITHM:
+            raise ValueError(f"FastHMACTokenCodec only supports {self.ALGORITHM}")
+        self._mac = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+        # jose 와 같은 헤더 (키 정렬, 공백 없음)
+        header = json.dumps({"alg": self.ALGORITHM, "typ": "JWT"}, separators=(",", ":"), sort_keys=True)
+        self._header_segment = _b64encode(header.encode("utf-8"))
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        payload = dict(claims)
+        for claim in TIME_CLAIMS:
+            value = payload.get(claim)
+            if isinstance(value, datetime):
+                payload[claim] = timegm(value.utctimetuple())
+        signing_input = self._header_segment + b"." + _b64encode(_json_dumps(payload))
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str) -> dict:
+        try:
+            raw = token.encode("ascii")
+            signing_input, signature_segment = raw.rsplit(b".", 1)
+            header_segment, payload_segment = signing_input.split(b".", 1)
+            if header_segment != self._header_segment:
+                header = _json_loads(_b64decode(header_segment))
+                if header.get("alg") != self.ALGORITHM:
+                    raise JWTError("The specified alg value is not allowed")
+            signature = _b64decode(signature_segment)
+            payload = _json_loads(_b64decode(payload_segment))
+        except JWTError:
+            raise
+        except (ValueError, UnicodeError, binascii.Error, AttributeError):
+            raise JWTError("Invalid token")
+
+        if not hmac.compare_digest(signature, self._sign(signing_input)):
+            raise JWTError("Signature verification failed")
+        if not isinstance(payload, dict):
+            raise JWTError("Invalid payload")
+
+        now = time.time()
+        exp = payload.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise JWTError("Expiration Time claim (exp) must be an integer")
+            if exp <= now:
+                raise JWTError("Signature has expired")
+        nbf = payload.get("nbf")
+        if nbf is not None:
+            if not isinstance(nbf, (int, float)):
+                raise JWTError("Not Before claim (nbf) must be an integer")
+            if nbf > now:
+                raise JWTError("The token is not yet valid (nbf)")
+        return payload
+
+
+def create_token_codec(backend: str, secret_key: str, algorithm: str):
+    if backend == "jose":
+        return JoseTokenCodec(secret_key, algorithm)
+    if backend == "fast":
+        return FastHMACTokenCodec(secret_key, algorithm)
+    raise ValueError(f"Unknown JWT_BACKEND: {backend}")
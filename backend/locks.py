@@ -0,0 +1,39 @@
+"""
+키별 asyncio 락 - 같은 멘토의 요청 상태 변경을 직렬화
+"""
+from contextlib import AsyncExitStack, asynccontextmanager
+import asyncio
+
+
+class KeyedLock:
+    """키마다 asyncio.Lock 하나
+
+    락을 기다리거나 잡고 있는 코루틴이 없어지면 항목을 지우므로
+    보관하는 락의 수는 동시에 사용 중인 키 수를 넘지 않는다.
+    한 프로세스 안에서만 유효하므로 여러 워커 사이의 직렬화는 저장소가 맡는다.
+    """
+
+    def __init__(self):
+        self._locks = {}  # {키: [Lock, 사용 중인 코루틴 수]}
+
+    @asynccontextmanager
+    async def hold(self, key):
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+    @asynccontextmanager
+    async def hold_many(self, keys):
+        """여러 키를 정렬된 순서로 잡아서 교착 상태를 피함"""
+        async with AsyncExitStack() as stack:
+            for key in sorted(set(keys)):
+                await stack.enter_async_context(self.hold(key))
+            yield
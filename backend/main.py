@@ -1,19 +1,31 @@
-from fastapi import FastAPI, HTTPException, Depends, status, File, UploadFile, Form
+from fastapi import FastAPI, HTTPException, Depends, status, Path, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, RedirectResponse
+from fastapi import Request
+from fastapi.responses import Response, RedirectResponse, StreamingResponse
 from typing import List, Optional
 import base64
 import uuid
-import io
 import json
 import json
 from models import (
-    UserRole, MatchRequestStatus, SignupRequest, LoginRequest, LoginResponse,
+    UserRole, SignupRequest, LoginRequest, LoginResponse,
     ProfileResponse, UserResponse, MatchRequestCreate, MatchRequestResponse,
-    MatchRequestOutgoing, UpdateProfileRequest
+    MatchRequestOutgoing, UpdateProfileRequest, RefreshRequest, LogoutRequest,
+    MatchRequestAction, MatchRequestBatchRequest, MatchRequestBatchResult, StreamTicketResponse, ID_MAX
 )
 from auth import *
+from storage import AsyncRepository, SQLiteRepository, create_repository
+from locks import KeyedLock
+from events import EVENT_FEED_INTERVAL_MS, ChangeFeed, EventHub
+from responses import FastJSONResponse
+import metrics
+import profiling
+from images import (
+    IMAGE_CACHE_CONTROL, IMAGE_MAX_BYTES, THUMBNAIL_SIZES, ImageTooLargeError,
+    InvalidImageError, etag_matches, http_date, normalize_image_async,
+    normalize_image_bytes_async, not_modified_since, read_multipart_file
+)
 
 app = FastAPI(
     title="Mentor-Mentee Matching API",
@@ -30,25 +42,167 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Sync-Version"],
 )
 
+# 요청 지표 (/metrics) - CORS 바깥에서 모든 요청을 잼
+if metrics.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# 요청 프로파일링 (PROFILE_SAMPLE_RATE / PROFILE_ADMIN_TOKEN 을 설정했을 때만 등록)
+if profiling.profiling_enabled():
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 security = HTTPBearer()
+# EventSource 는 헤더를 붙일 수 없으므로 이벤트 스트림은 ticket 쿼리 파라미터도 허용
+optional_security = HTTPBearer(auto_error=False)
+
+# 저장소 (STORAGE_BACKEND 환경변수로 memory / sqlite 선택)
+repo = AsyncRepository(create_repository())
+
+# 같은 멘토의 요청 상태 변경(수락/거절/취소)은 한 번에 하나씩
+mentor_locks = KeyedLock()
+
+# 매칭 요청 변경 이벤트 (SSE)
+event_hub = EventHub()
 
-# 메모리 저장소
-users_db = {}  # {id: user_data}
-profiles_db = {}  # {user_id: profile_data}
-match_requests_db = {}  # {id: match_request_data}
-images_db = {}  # {user_id: base64_image_data}
-user_counter = 1
-request_counter = 1
+metrics.registry.register(metrics.Gauge(
+    "event_stream_subscribers", "연결된 이벤트 스트림 구독자 수",
+    collect=lambda: {(): event_hub.stats()["subscribers"]},
+))
+event_loop_lag_monitor = metrics.EventLoopLagMonitor()
+
+# 일괄 처리 API 한 번에 처리하는 최대 요청 수
+MAX_BATCH_OPERATIONS = 100
+
+# 일괄 처리 동작별 (허용 역할, 소유자 필드, 변경할 상태, 역할 오류, 소유자 오류) - 단건 API 와 같은 규칙
+MATCH_REQUEST_ACTIONS = {
+    MatchRequestAction.ACCEPT: (
+        "mentor", "mentorId", "accepted",
+        "Only mentors can accept requests", "Cannot accept other mentor's request"
+    ),
+    MatchRequestAction.REJECT: (
+        "mentor", "mentorId", "rejected",
+        "Only mentors can reject requests", "Cannot reject other mentor's request"
+    ),
+    MatchRequestAction.CANCEL: (
+        "mentee", "menteeId", "cancelled",
+        "Only mentees can cancel requests", "Cannot cancel other mentee's request"
+    ),
+}
 
 # 기본 프로필 이미지 URL
 DEFAULT_MENTOR_IMAGE = "https://placehold.co/500x500.jpg?text=MENTOR"
 DEFAULT_MENTEE_IMAGE = "https://placehold.co/500x500.jpg?text=MENTEE"
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    payload = verify_token(token)
+# 멘토 목록 페이지네이션
+MAX_MENTOR_PAGE_SIZE = 100
+PROFILE_FIELDS = ("name", "bio", "imageUrl", "skills")
+
+def mentor_order(order_by: Optional[str]) -> str:
+    return order_by if order_by in ("name", "skill") else "id"
+
+def encode_mentor_cursor(order: str, entry: tuple) -> str:
+    """(정렬 기준, 마지막 정렬키)를 불투명한 커서 문자열로 인코딩"""
+    raw = json.dumps({"o": order, "k": list(entry)}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_mentor_cursor(cursor: str, order: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key, mentor_id = data["k"]
+        key_type = int if order == "id" else str
+        if data["o"] != order or not isinstance(key, key_type) or not isinstance(mentor_id, int):
+            raise ValueError("cursor order mismatch")
+        return (key, mentor_id)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def parse_profile_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """fields=name,skills 형태의 프로필 필드 선택 파싱"""
+    if fields is None:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in PROFILE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown profile fields: {', '.join(unknown)}"
+        )
+    return selected
+
+def access_token_data(user: dict) -> dict:
+    """액세스 토큰에 담을 사용자 클레임"""
+    return {
+        "sub": str(user["id"]),
+        "email": user["email"],
+        "name": user["name"],
+        "role": user["role"]
+    }
+
+def broadcast_request_changes(changed: List[dict]):
+    """바뀐 요청마다 이 프로세스에 연결된 해당 멘토와 멘티에게 이벤트 발행"""
+    for request_data in changed:
+        event_type = "created" if request_data["status"] == "pending" else request_data["status"]
+        event_hub.publish(
+            (request_data["mentorId"], request_data["menteeId"]),
+            "match-request",
+            {"type": event_type, "request": dict(request_data)}
+        )
+
+# SQLite 는 여러 워커 프로세스가 함께 쓰므로 다른 워커가 처리한 변경을 저장소에서 읽어 전달
+request_feed = (
+    ChangeFeed(repo, event_hub, broadcast_request_changes)
+    if isinstance(repo.sync, SQLiteRepository) and EVENT_FEED_INTERVAL_MS > 0 else None
+)
+
+def publish_request_changes(changed: List[dict]):
+    """요청을 바꾼 뒤 호출 - 이 프로세스의 구독자에게 바로 발행 (다른 워커에는 request_feed 가 전달)"""
+    broadcast_request_changes(changed)
+    if request_feed is not None:
+        request_feed.mark_published(changed)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return await authenticate_token(credentials.credentials)
+
+async def get_stream_user(
+    ticket: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """Authorization 헤더 또는 ticket 쿼리 파라미터 (1회용 스트림 티켓) 로 인증
+
+    URL 은 접근 로그에 남으므로 액세스 토큰 대신 짧게 유효한 티켓을 받는다.
+    """
+    if credentials is not None:
+        return await authenticate_token(credentials.credentials)
+    if not ticket:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    payload = verify_stream_ticket(ticket)
+    # 사용한 티켓은 만료 시각까지 폐기 목록에 등록해 다시 쓸 수 없게 함 (확인과 등록을 한 번에)
+    if not await repo.consume_token(payload["jti"], payload["exp"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Stream ticket already used"
+        )
+    user = await repo.get_user(int(payload["sub"]))
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return user
+
+async def authenticate_token(token: str) -> dict:
+    """토큰 검증 + 폐기 여부 확인 + 사용자 조회"""
+    payload = verify_token_cached(token)
     user_id = payload.get("sub")
     if user_id is None:
         raise HTTPException(
@@ -56,7 +210,23 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="Invalid token"
         )
     
-    user = users_db.get(int(user_id))
+    # 스트림 티켓 등 용도가 정해진 토큰은 액세스 토큰으로 쓸 수 없음
+    if payload.get("purpose") is not None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+    
+    # 로그아웃/폐기된 토큰 확인 - jti 로 O(1) 조회
+    jti = payload.get("jti")
+    if jti is not None and await repo.is_token_revoked(jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user = await repo.get_user(int(user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -70,6 +240,32 @@ async def root():
     """루트 경로 - Swagger UI로 리다이렉트"""
     return RedirectResponse(url="/swagger-ui")
 
+@app.on_event("startup")
+async def start_event_loop_lag_monitor():
+    if metrics.METRICS_ENABLED:
+        event_loop_lag_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_event_loop_lag_monitor():
+    await event_loop_lag_monitor.stop()
+
+@app.on_event("startup")
+async def start_request_feed():
+    if request_feed is not None:
+        await request_feed.start()
+
+@app.on_event("shutdown")
+async def stop_request_feed():
+    if request_feed is not None:
+        await request_feed.stop()
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus 텍스트 형식 지표"""
+    if not metrics.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/v3/api-docs")
 async def get_openapi_spec():
     """OpenAPI 스펙 반환 (Spring Boot 스타일)"""
@@ -78,29 +274,14 @@ async def get_openapi_spec():
 # 1. 인증 API
 @app.post("/api/signup", status_code=201)
 async def signup(request: SignupRequest):
-    global user_counter
-    
-    # 이메일 중복 확인
-    for user in users_db.values():
-        if user["email"] == request.email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-    
-    # 사용자 생성
-    user_id = user_counter
-    user_counter += 1
-    
-    user_data = {
-        "id": user_id,
-        "email": request.email,
-        "password": get_password_hash(request.password),
-        "name": request.name,
-        "role": request.role.value
-    }
+    # 이메일 중복 확인 (해시 계산 전에 빠르게 거절)
+    if await repo.get_user_by_email(request.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
-    users_db[user_id] = user_data
+    hashed_password = await get_password_hash_async(request.password)
     
     # 기본 프로필 생성
     default_image_url = DEFAULT_MENTOR_IMAGE if request.role == UserRole.MENTOR else DEFAULT_MENTEE_IMAGE
@@ -113,36 +294,90 @@ async def signup(request: SignupRequest):
     if request.role == UserRole.MENTOR:
         profile_data["skills"] = []
     
-    profiles_db[user_id] = profile_data
+    # 사용자 생성 - 해시 계산 중 같은 이메일로 먼저 가입된 경우 저장소가 None 반환
+    user_data = await repo.create_user(
+        request.email, hashed_password, request.name, request.role.value, profile_data
+    )
+    if user_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     return {"message": "User created successfully"}
 
 @app.post("/api/login")
 async def login(request: LoginRequest):
     # 사용자 찾기
-    user = None
-    for u in users_db.values():
-        if u["email"] == request.email:
-            user = u
-            break
+    user = await repo.get_user_by_email(request.email)
     
-    if not user or not verify_password(request.password, user["password"]):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
-    # JWT 토큰 생성
-    token_data = {
-        "sub": str(user["id"]),
-        "email": user["email"],
-        "name": user["name"],
-        "role": user["role"]
-    }
+    verified, new_hash = await verify_and_update_password_async(request.password, user["password"])
+    if not verified:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password"
+        )
+    
+    # 해시 스킴/비용 설정이 바뀌었으면 평문을 알고 있는 지금 새 설정으로 교체
+    if new_hash:
+        await repo.update_password_hash(user["id"], new_hash)
     
-    access_token = create_access_token(token_data)
+    # JWT 토큰 + 리프레시 토큰 생성 (새 로그인마다 새 family)
+    refresh_token, refresh_hash, refresh_expires_at = create_refresh_token()
+    await repo.save_refresh_token(refresh_hash, uuid.uuid4().hex, user["id"], refresh_expires_at)
     
-    return LoginResponse(token=access_token)
+    return LoginResponse(token=create_access_token(access_token_data(user)), refreshToken=refresh_token)
+
+@app.post("/api/token/refresh")
+async def refresh_access_token(request: RefreshRequest):
+    """리프레시 토큰으로 액세스 토큰 재발급 (비밀번호 검증 없이 해시 조회 + JWT 서명만 수행)
+    
+    사용한 리프레시 토큰은 새 토큰으로 교체되고, 이미 사용된 토큰이 다시 오면
+    같은 로그인에서 발급된 리프레시 토큰을 모두 폐기함
+    """
+    new_refresh_token, new_refresh_hash, refresh_expires_at = create_refresh_token()
+    user_id = await repo.rotate_refresh_token(
+        hash_refresh_token(request.refreshToken), new_refresh_hash, refresh_expires_at
+    )
+    user = await repo.get_user(user_id) if user_id is not None else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    
+    return LoginResponse(token=create_access_token(access_token_data(user)), refreshToken=new_refresh_token)
+
+@app.post("/api/logout")
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: dict = Depends(get_current_user)
+):
+    """로그아웃 - 현재 토큰을 만료 시각까지 폐기 목록에 등록
+    
+    refreshToken 을 함께 보내면 같은 로그인의 리프레시 토큰도 모두 폐기
+    """
+    token = credentials.credentials
+    payload = verify_token_cached(token)
+    if "jti" not in payload or "exp" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token cannot be revoked"
+        )
+    
+    await repo.revoke_token(payload["jti"], payload["exp"])
+    token_cache.invalidate(token)
+    if request is not None and request.refreshToken:
+        await repo.revoke_refresh_token(hash_refresh_token(request.refreshToken))
+    
+    return {"message": "Logged out successfully"}
 
 @app.get("/main")
 async def main_page():
@@ -153,7 +388,7 @@ async def main_page():
 @app.get("/api/me")
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     user_id = current_user["id"]
-    profile = profiles_db.get(user_id, {})
+    profile = await repo.get_profile(user_id)
     
     return UserResponse(
         id=user_id,
@@ -163,17 +398,47 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     )
 
 @app.get("/api/images/{role}/{id}")
-async def get_profile_image(role: str, id: int, current_user: dict = Depends(get_current_user)):
-    """프로필 이미지 반환"""
-    image_data = images_db.get(id)
+async def get_profile_image(
+    role: str,
+    http_request: Request,
+    id: int = Path(ge=1, le=ID_MAX),
+    size: Optional[int] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """프로필 이미지 반환 (ETag / Last-Modified 조건부 요청 지원)
     
-    if image_data:
-        # Base64 디코딩해서 이미지 반환
-        try:
-            image_bytes = base64.b64decode(image_data)
-            return Response(content=image_bytes, media_type="image/jpeg")
-        except:
-            pass
+    size 로 썸네일 크기(64, 128)를 지정하면 작은 이미지를 반환
+    """
+    if size is not None and size not in THUMBNAIL_SIZES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"size must be one of {', '.join(map(str, THUMBNAIL_SIZES))}"
+        )
+    
+    image = await repo.get_image(id, str(size) if size else "original")
+    
+    if image:
+        headers = {
+            "ETag": f'"{image["digest"]}"',
+            "Last-Modified": http_date(image["updated_at"]),
+            "Cache-Control": IMAGE_CACHE_CONTROL,
+        }
+        
+        # If-None-Match 가 있으면 If-Modified-Since 는 무시 (RFC 7232 6)
+        if_none_match = http_request.headers.get("if-none-match")
+        if_modified_since = http_request.headers.get("if-modified-since")
+        if if_none_match is not None:
+            not_modified = etag_matches(if_none_match, headers["ETag"])
+        else:
+            not_modified = (
+                if_modified_since is not None
+                and not_modified_since(if_modified_since, image["updated_at"])
+            )
+        if not_modified:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        # 업로드 시 디코딩해 둔 바이트를 그대로 반환
+        return Response(content=image["data"], media_type=image["media_type"], headers=headers)
     
     # 기본 이미지 URL로 리다이렉트
     default_url = DEFAULT_MENTOR_IMAGE if role == "mentor" else DEFAULT_MENTEE_IMAGE
@@ -182,81 +447,153 @@ async def get_profile_image(role: str, id: int, current_user: dict = Depends(get
 @app.put("/api/profile")
 async def update_profile(request: UpdateProfileRequest, current_user: dict = Depends(get_current_user)):
     user_id = current_user["id"]
+    role = UserRole(current_user["role"])
     
-    # 사용자 정보 업데이트
-    users_db[user_id]["name"] = request.name
+    # 이미지는 업로드 시 한 번만 디코딩/검증/재인코딩 (워커 풀에서 실행)
+    image_variants = None
+    if request.image:
+        try:
+            image_variants = await normalize_image_async(request.image)
+        except InvalidImageError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
     
     # 프로필 정보 업데이트
     profile_data = {
         "name": request.name,
         "bio": request.bio,
-        "imageUrl": f"/api/images/{request.role.value}/{user_id}"
+        "imageUrl": f"/api/images/{role.value}/{user_id}"
     }
     
-    if request.role == UserRole.MENTOR and request.skills:
+    if role == UserRole.MENTOR and request.skills:
         profile_data["skills"] = request.skills
     
-    profiles_db[user_id] = profile_data
+    await repo.update_profile(user_id, request.name, profile_data)
     
     # 이미지 저장
-    if request.image:
-        images_db[user_id] = request.image
+    if image_variants:
+        await repo.save_image(user_id, image_variants)
     
     return UserResponse(
         id=user_id,
         email=current_user["email"],
-        role=request.role,
+        role=role,
+        profile=ProfileResponse(**profile_data)
+    )
+
+# multipart 헤더/경계 문자열 등 파일 외 부분에 허용하는 여유분
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+@app.put(
+    "/api/profile/image",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["image"],
+                        "properties": {"image": {"type": "string", "format": "binary"}}
+                    }
+                }
+            }
+        }
+    }
+)
+async def upload_profile_image(http_request: Request, current_user: dict = Depends(get_current_user)):
+    """프로필 이미지 업로드 (multipart/form-data, image 필드)
+    
+    본문을 스트리밍으로 읽으면서 1MB 제한을 검사하므로
+    Base64 JSON 업로드보다 전송량과 메모리 사용량이 적음
+    """
+    user_id = current_user["id"]
+    role = UserRole(current_user["role"])
+    
+    content_length = http_request.headers.get("content-length")
+    if content_length and content_length.isdigit() and \
+            int(content_length) > IMAGE_MAX_BYTES + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Image must be 1MB or smaller"
+        )
+    
+    try:
+        image_bytes = await read_multipart_file(http_request, "image")
+        image_variants = await normalize_image_bytes_async(image_bytes)
+    except ImageTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except InvalidImageError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    await repo.save_image(user_id, image_variants)
+    
+    # 기본 이미지 URL 을 쓰던 프로필은 업로드한 이미지 URL 로 변경
+    profile_data = dict(await repo.get_profile(user_id))
+    profile_data["imageUrl"] = f"/api/images/{role.value}/{user_id}"
+    await repo.update_profile(user_id, current_user["name"], profile_data)
+    
+    return UserResponse(
+        id=user_id,
+        email=current_user["email"],
+        role=role,
         profile=ProfileResponse(**profile_data)
     )
 
 # 3. 멘토 리스트 API
-@app.get("/api/mentors")
+@app.get("/api/mentors", response_class=FastJSONResponse)
 async def get_mentors(
     skill: Optional[str] = None,
     order_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_MENTOR_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """멘토 리스트 조회 (멘티만 접근 가능)"""
+    """멘토 리스트 조회 (멘티만 접근 가능)
+    
+    limit 지정 시 다음 페이지 커서를 X-Next-Cursor 헤더로 반환하고,
+    fields 로 프로필 필드를 골라 받을 수 있음 (예: fields=name,imageUrl,skills)
+    목록이 길어질 수 있어 jsonable_encoder 를 거치지 않고 바로 직렬화
+    """
     if current_user["role"] != "mentee":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only mentees can access mentor list"
         )
     
+    order = mentor_order(order_by)
+    after = decode_mentor_cursor(cursor, order) if cursor else None
+    profile_fields = parse_profile_fields(fields)
+    
+    # 스킬 인덱스와 미리 정렬된 목록으로 조회
+    entries = await repo.list_mentors(skill, order, after, limit)
+    
     mentors = []
-    for user_id, user in users_db.items():
-        if user["role"] == "mentor":
-            profile = profiles_db.get(user_id, {})
-            mentor_data = {
-                "id": user_id,
-                "email": user["email"],
-                "role": user["role"],
-                "profile": profile
-            }
-            
-            # 스킬 필터링
-            if skill:
-                if "skills" in profile and skill.lower() in [s.lower() for s in profile["skills"]]:
-                    mentors.append(mentor_data)
-            else:
-                mentors.append(mentor_data)
+    for _, mentor in entries:
+        if profile_fields is not None:
+            profile = mentor["profile"]
+            mentor = {**mentor, "profile": {f: profile[f] for f in profile_fields if f in profile}}
+        mentors.append(mentor)
     
-    # 정렬
-    if order_by == "name":
-        mentors.sort(key=lambda x: x["profile"].get("name", ""))
-    elif order_by == "skill":
-        mentors.sort(key=lambda x: ",".join(x["profile"].get("skills", [])))
-    else:
-        mentors.sort(key=lambda x: x["id"])
+    headers = {}
+    if limit is not None and len(entries) == limit:
+        headers["X-Next-Cursor"] = encode_mentor_cursor(order, entries[-1][0])
     
-    return mentors
+    return FastJSONResponse(mentors, headers=headers)
 
 # 4. 매칭 요청 API
 @app.post("/api/match-requests")
 async def create_match_request(request: MatchRequestCreate, current_user: dict = Depends(get_current_user)):
     """매칭 요청 생성 (멘티만 가능)"""
-    global request_counter
-    
     if current_user["role"] != "mentee":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -264,7 +601,7 @@ async def create_match_request(request: MatchRequestCreate, current_user: dict =
         )
     
     # 멘토 존재 확인
-    mentor = users_db.get(request.mentorId)
+    mentor = await repo.get_user(request.mentorId)
     if not mentor or mentor["role"] != "mentor":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -272,70 +609,113 @@ async def create_match_request(request: MatchRequestCreate, current_user: dict =
         )
     
     # 중복 요청 확인
-    for req in match_requests_db.values():
-        if (req["menteeId"] == current_user["id"] and 
-            req["mentorId"] == request.mentorId and 
-            req["status"] == "pending"):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Request already sent to this mentor"
-            )
+    duplicate_error = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Request already sent to this mentor"
+    )
+    if await repo.has_pending_request(current_user["id"], request.mentorId):
+        raise duplicate_error
     
     # 매칭 요청 생성
-    request_id = request_counter
-    request_counter += 1
-    
-    match_request = {
-        "id": request_id,
-        "mentorId": request.mentorId,
-        "menteeId": request.menteeId,
-        "message": request.message,
-        "status": "pending"
-    }
+    match_request = await repo.create_match_request(request.mentorId, request.menteeId, request.message)
+    if match_request is None:
+        raise duplicate_error
     
-    match_requests_db[request_id] = match_request
+    publish_request_changes([match_request])
     
     return MatchRequestResponse(**match_request)
 
-@app.get("/api/match-requests/incoming")
-async def get_incoming_requests(current_user: dict = Depends(get_current_user)):
-    """들어온 매칭 요청 조회 (멘토만 가능)"""
+@app.get(
+    "/api/match-requests/incoming",
+    response_model=List[MatchRequestResponse],
+    response_class=FastJSONResponse
+)
+async def get_incoming_requests(
+    since: Optional[int] = Query(None, ge=0, le=ID_MAX),
+    current_user: dict = Depends(get_current_user)
+):
+    """들어온 매칭 요청 조회 (멘토만 가능)
+    
+    X-Sync-Version 헤더로 현재 version 을 반환하고, 다음 조회에서 since 로 넘기면
+    그 이후 생성/변경된 요청만 받을 수 있음
+    """
     if current_user["role"] != "mentor":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only mentors can view incoming requests"
         )
     
-    requests = []
-    for req in match_requests_db.values():
-        if req["mentorId"] == current_user["id"]:
-            requests.append(MatchRequestResponse(**req))
-    
-    return requests
+    request_list, version = await repo.list_requests_for_mentor(current_user["id"], since)
+    
+    # 모델 객체를 만들지 않고 MatchRequestResponse 와 같은 모양의 dict 로 바로 직렬화
+    requests = [
+        {
+            "id": req["id"],
+            "mentorId": req["mentorId"],
+            "menteeId": req["menteeId"],
+            "message": req["message"],
+            "status": req["status"]
+        }
+        for req in request_list
+    ]
+    
+    return FastJSONResponse(requests, headers={"X-Sync-Version": str(version)})
 
-@app.get("/api/match-requests/outgoing")
-async def get_outgoing_requests(current_user: dict = Depends(get_current_user)):
-    """보낸 매칭 요청 조회 (멘티만 가능)"""
+@app.get(
+    "/api/match-requests/outgoing",
+    response_model=List[MatchRequestOutgoing],
+    response_class=FastJSONResponse
+)
+async def get_outgoing_requests(
+    since: Optional[int] = Query(None, ge=0, le=ID_MAX),
+    current_user: dict = Depends(get_current_user)
+):
+    """보낸 매칭 요청 조회 (멘티만 가능)
+    
+    since / X-Sync-Version 은 들어온 요청 조회와 같음
+    """
     if current_user["role"] != "mentee":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only mentees can view outgoing requests"
         )
     
-    requests = []
-    for req in match_requests_db.values():
-        if req["menteeId"] == current_user["id"]:
-            requests.append(MatchRequestOutgoing(
-                id=req["id"],
-                mentorId=req["mentorId"],
-                menteeId=req["menteeId"],
-                status=req["status"]
-            ))
+    request_list, version = await repo.list_requests_for_mentee(current_user["id"], since)
     
-    return requests
+    requests = [
+        {"id": req["id"], "mentorId": req["mentorId"], "menteeId": req["menteeId"], "status": req["status"]}
+        for req in request_list
+    ]
+    
+    return FastJSONResponse(requests, headers={"X-Sync-Version": str(version)})
+
+@app.post("/api/match-requests/events/ticket", response_model=StreamTicketResponse)
+async def create_match_request_events_ticket(current_user: dict = Depends(get_current_user)):
+    """이벤트 스트림 연결용 1회용 티켓 발급 (STREAM_TICKET_EXPIRE_SECONDS 동안 유효)"""
+    return StreamTicketResponse(
+        ticket=create_stream_ticket(current_user["id"]),
+        expiresIn=STREAM_TICKET_EXPIRE_SECONDS
+    )
+
+@app.get("/api/match-requests/events")
+async def match_request_events(current_user: dict = Depends(get_stream_user)):
+    """매칭 요청 변경 이벤트 스트림 (text/event-stream)
+    
+    내가 멘토나 멘티인 요청이 생성/수락/거절/취소되면
+    event: match-request, data: {"type", "request"} 메시지를 받음.
+    브라우저 EventSource 는 헤더를 붙일 수 없으므로 티켓 발급 API 로 받은
+    ?ticket=<티켓> 으로 인증
+    """
+    return StreamingResponse(
+        event_hub.stream(current_user["id"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.put("/api/match-requests/{request_id}/accept")
-async def accept_match_request(request_id: int, current_user: dict = Depends(get_current_user)):
+async def accept_match_request(
+    request_id: int = Path(ge=1, le=ID_MAX), current_user: dict = Depends(get_current_user)
+):
     """매칭 요청 수락 (멘토만 가능)"""
     if current_user["role"] != "mentor":
         raise HTTPException(
@@ -343,7 +723,7 @@ async def accept_match_request(request_id: int, current_user: dict = Depends(get
             detail="Only mentors can accept requests"
         )
     
-    request_data = match_requests_db.get(request_id)
+    request_data = await repo.get_match_request(request_id)
     if not request_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -356,20 +736,24 @@ async def accept_match_request(request_id: int, current_user: dict = Depends(get
             detail="Cannot accept other mentor's request"
         )
     
-    # 요청 수락
-    request_data["status"] = "accepted"
+    # 요청 수락 + 같은 멘토의 다른 대기중인 요청들을 자동으로 거절
+    # 동시에 들어온 수락 중 하나만 성공하고 나머지는 대기 상태 확인에서 실패
+    async with mentor_locks.hold(request_data["mentorId"]):
+        changed = await repo.accept_match_request(request_id)
+    if changed is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request is no longer pending"
+        )
     
-    # 다른 대기중인 요청들을 자동으로 거절
-    for req in match_requests_db.values():
-        if (req["mentorId"] == current_user["id"] and 
-            req["id"] != request_id and 
-            req["status"] == "pending"):
-            req["status"] = "rejected"
+    publish_request_changes(changed)
     
-    return MatchRequestResponse(**request_data)
+    return MatchRequestResponse(**changed[0])
 
 @app.put("/api/match-requests/{request_id}/reject")
-async def reject_match_request(request_id: int, current_user: dict = Depends(get_current_user)):
+async def reject_match_request(
+    request_id: int = Path(ge=1, le=ID_MAX), current_user: dict = Depends(get_current_user)
+):
     """매칭 요청 거절 (멘토만 가능)"""
     if current_user["role"] != "mentor":
         raise HTTPException(
@@ -377,7 +761,7 @@ async def reject_match_request(request_id: int, current_user: dict = Depends(get
             detail="Only mentors can reject requests"
         )
     
-    request_data = match_requests_db.get(request_id)
+    request_data = await repo.get_match_request(request_id)
     if not request_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -390,12 +774,17 @@ async def reject_match_request(request_id: int, current_user: dict = Depends(get
             detail="Cannot reject other mentor's request"
         )
     
-    request_data["status"] = "rejected"
+    async with mentor_locks.hold(request_data["mentorId"]):
+        request_data = await repo.set_request_status(request_id, "rejected")
+    
+    publish_request_changes([request_data])
     
     return MatchRequestResponse(**request_data)
 
 @app.delete("/api/match-requests/{request_id}")
-async def cancel_match_request(request_id: int, current_user: dict = Depends(get_current_user)):
+async def cancel_match_request(
+    request_id: int = Path(ge=1, le=ID_MAX), current_user: dict = Depends(get_current_user)
+):
     """매칭 요청 취소 (멘티만 가능)"""
     if current_user["role"] != "mentee":
         raise HTTPException(
@@ -403,7 +792,7 @@ async def cancel_match_request(request_id: int, current_user: dict = Depends(get
             detail="Only mentees can cancel requests"
         )
     
-    request_data = match_requests_db.get(request_id)
+    request_data = await repo.get_match_request(request_id)
     if not request_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -416,6 +805,59 @@ async def cancel_match_request(request_id: int, current_user: dict = Depends(get
             detail="Cannot cancel other mentee's request"
         )
     
-    request_data["status"] = "cancelled"
+    async with mentor_locks.hold(request_data["mentorId"]):
+        request_data = await repo.set_request_status(request_id, "cancelled")
+    
+    publish_request_changes([request_data])
     
     return MatchRequestResponse(**request_data)
+
+@app.post("/api/match-requests/batch")
+async def batch_match_requests(request: MatchRequestBatchRequest, current_user: dict = Depends(get_current_user)):
+    """매칭 요청 일괄 처리 (accept / reject / cancel)
+    
+    인증과 조회는 한 번만 하고, 관련 멘토 락을 한 번 잡은 상태에서
+    하나의 트랜잭션으로 순서대로 적용함. 결과는 요청 순서대로 항목별 상태 코드로 반환
+    """
+    operations = request.operations
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_OPERATIONS} operations per batch"
+        )
+    
+    requests_by_id = await repo.get_match_requests([op.id for op in operations])
+    
+    results = [None] * len(operations)
+    changes = []  # [(결과 위치, request_id, 상태)]
+    for i, op in enumerate(operations):
+        role, owner_field, new_status, role_error, owner_error = MATCH_REQUEST_ACTIONS[op.action]
+        request_data = requests_by_id.get(op.id)
+        if current_user["role"] != role:
+            results[i] = MatchRequestBatchResult(id=op.id, action=op.action, status=403, detail=role_error)
+        elif request_data is None:
+            results[i] = MatchRequestBatchResult(id=op.id, action=op.action, status=404, detail="Request not found")
+        elif request_data[owner_field] != current_user["id"]:
+            results[i] = MatchRequestBatchResult(id=op.id, action=op.action, status=403, detail=owner_error)
+        else:
+            changes.append((i, op.id, new_status))
+    
+    if changes:
+        mentor_ids = {requests_by_id[request_id]["mentorId"] for _, request_id, _ in changes}
+        async with mentor_locks.hold_many(mentor_ids):
+            updated = await repo.apply_request_status_changes(
+                [(request_id, new_status) for _, request_id, new_status in changes]
+            )
+        for (i, request_id, _), changed in zip(changes, updated):
+            action = operations[i].action
+            if changed is None:
+                results[i] = MatchRequestBatchResult(
+                    id=request_id, action=action, status=400, detail="Request is no longer pending"
+                )
+            else:
+                publish_request_changes(changed)
+                results[i] = MatchRequestBatchResult(
+                    id=request_id, action=action, status=200, request=MatchRequestResponse(**changed[0])
+                )
+    
+    return results
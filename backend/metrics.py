@@ -0,0 +1,267 @@
+"""
+Prometheus 텍스트 형식 지표 - 요청 지연 히스토그램, 처리 중 요청 수, 상태 코드 카운터,
+비밀번호 해시 / JWT 처리 시간, 이벤트 루프 지연
+
+외부 라이브러리 없이 필요한 만큼만 구현한다. 지표는 프로세스 단위이고 워커 사이에
+합치지 않는다. run_server.py --mode production 으로 워커를 여러 개 띄우면 모든 워커가
+같은 포트를 쓰므로 /metrics 요청마다 임의의 한 워커 값만 보이고, 카운터도 응답한
+워커에 따라 오르내린다. 합계가 필요하면 워커 1개짜리 서버를 포트별로 띄워 각각 수집한다.
+"""
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import asyncio
+import bisect
+import os
+import threading
+import time
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+EVENT_LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("EVENT_LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+
+# 초 단위 (Prometheus 기본값 + 1ms, 2.5ms)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Response 가 charset=utf-8 을 붙임
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}  # {label 값 튜플: 값}
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """값을 직접 바꾸거나, collect 함수로 수집 시점에 값을 읽음"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 collect: Optional[Callable[[], Dict[tuple, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._collect = collect
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> list:
+        if self._collect is not None:
+            values = sorted(self._collect().items())
+        else:
+            with self._lock:
+                values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # [버킷별 개수 (마지막은 +Inf), 합계]
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, *labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def render(self) -> list:
+        with self._lock:
+            values = sorted((labels, (list(state[0]), state[1])) for labels, state in self._values.items())
+        lines = self.header()
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="{}"'.format(_format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> bytes:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+registry = Registry()
+
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "처리 중인 HTTP 요청 수"))
+HTTP_REQUEST_DURATION_SECONDS = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간 (응답 시작까지)", ("method", "route")))
+HTTP_RESPONSES_TOTAL = registry.register(Counter(
+    "http_responses_total", "HTTP 응답 수 (상태 코드별)", ("method", "route", "status")))
+PASSWORD_HASH_SECONDS = registry.register(Histogram(
+    "password_hash_seconds", "비밀번호 해시 / 검증 시간", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5)))
+JWT_SECONDS = registry.register(Histogram(
+    "jwt_seconds", "JWT 인코딩 / 디코딩 시간", ("operation",),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)))
+EVENT_LOOP_LAG_SECONDS = registry.register(Histogram(
+    "event_loop_lag_seconds", "이벤트 루프 지연 (예정보다 늦게 깨어난 시간)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)))
+
+
+class MetricsMiddleware:
+    """요청별 지연 / 상태 코드 / 처리 중 요청 수 기록 (ASGI 미들웨어)
+
+    route 라벨은 경로 템플릿 (예: /api/images/{role}/{id}) 이고, 라우트가 없는
+    경로는 모두 "unmatched" 로 묶어서 라벨 종류가 늘어나지 않게 한다.
+    스트리밍 응답 (SSE) 은 응답 시작까지만 잰다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths = None  # {endpoint: 경로 템플릿}
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._route_paths is None:
+            self._route_paths = {
+                getattr(route, "endpoint", None): route.path
+                for route in scope["app"].routes if hasattr(route, "path")
+            }
+        return self._route_paths.get(endpoint, "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        status_code = 500
+        recorded = False
+
+        def record():
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            route = self._route_label(scope)
+            HTTP_REQUEST_DURATION_SECONDS.observe(time.perf_counter() - started, method, route)
+            HTTP_RESPONSES_TOTAL.inc(method, route, str(status_code))
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                record()
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            record()
+
+
+class EventLoopLagMonitor:
+    """주기적으로 잠들었다 깨어나면서 예정보다 늦어진 시간을 기록
+
+    동기 작업 (bcrypt, base64 디코딩 등) 이 이벤트 루프를 막으면 지연이 커진다.
+    """
+
+    def __init__(self, interval_seconds: float = EVENT_LOOP_LAG_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - expected))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,7 +1,11 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field
+from typing import Annotated, Optional, List
 from enum import Enum
 
+# 요청으로 받는 id 범위 - SQLite INTEGER (부호 있는 64비트) 를 넘으면 드라이버가 OverflowError 를 냄
+ID_MAX = 2**63 - 1
+RequestId = Annotated[int, Field(ge=1, le=ID_MAX)]
+
 class UserRole(str, Enum):
     MENTOR = "mentor"
     MENTEE = "mentee"
@@ -25,6 +29,17 @@ class LoginRequest(BaseModel):
 
 class LoginResponse(BaseModel):
     token: str
+    refreshToken: Optional[str] = None
+
+class StreamTicketResponse(BaseModel):
+    ticket: str
+    expiresIn: int  # 초
+
+class RefreshRequest(BaseModel):
+    refreshToken: str
+
+class LogoutRequest(BaseModel):
+    refreshToken: Optional[str] = None
 
 # Profile models
 class ProfileResponse(BaseModel):
@@ -47,8 +62,8 @@ class UpdateProfileRequest(BaseModel):
 
 # Match request models
 class MatchRequestCreate(BaseModel):
-    mentorId: int
-    menteeId: int
+    mentorId: RequestId
+    menteeId: RequestId
     message: str
 
 class MatchRequestResponse(BaseModel):
@@ -58,6 +73,25 @@ class MatchRequestResponse(BaseModel):
     message: str
     status: MatchRequestStatus
 
+class MatchRequestAction(str, Enum):
+    ACCEPT = "accept"
+    REJECT = "reject"
+    CANCEL = "cancel"
+
+class MatchRequestBatchOperation(BaseModel):
+    id: RequestId
+    action: MatchRequestAction
+
+class MatchRequestBatchRequest(BaseModel):
+    operations: List[MatchRequestBatchOperation]
+
+class MatchRequestBatchResult(BaseModel):
+    id: int
+    action: MatchRequestAction
+    status: int  # 단건 API 였다면 받았을 HTTP 상태 코드
+    detail: Optional[str] = None
+    request: Optional[MatchRequestResponse] = None
+
 class MatchRequestOutgoing(BaseModel):
     id: int
     mentorId: int
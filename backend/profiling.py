@@ -0,0 +1,195 @@
+"""
+요청 단위 샘플링 프로파일러 (선택 사항)
+
+다음 중 하나일 때 요청 하나를 프로파일링한다.
+    - PROFILE_ADMIN_TOKEN 이 설정되어 있고 요청의 X-Profile-Token 헤더가 같을 때
+    - PROFILE_SAMPLE_RATE 확률에 뽑혔을 때
+둘 다 설정하지 않으면 미들웨어를 등록하지 않으므로 추가 비용이 없다.
+
+프로파일링 중에는 별도 스레드가 PROFILE_INTERVAL_MS 마다 이벤트 루프 스레드와
+일하는 중인 다른 스레드 (비밀번호 해시 워커 등) 의 스택을 읽어서 센다. 스택의
+첫 프레임은 스레드 이름이다. 결과는 flamegraph.pl / speedscope 에서 바로 읽을 수 있는
+collapsed stack 형식 ("frame;frame;frame count") 으로 PROFILE_DIR 에 저장하고,
+파일은 최근 PROFILE_MAX_FILES 개만 남긴다.
+
+이벤트 루프는 여러 요청을 번갈아 처리하므로 같은 시간에 처리된 다른 요청의
+스택도 함께 잡힌다. 한 번에 한 요청만 프로파일링한다.
+"""
+from collections import Counter, deque
+import asyncio
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+# 연결이 오래 유지되는 경로는 다른 요청의 프로파일링을 막으므로 제외
+PROFILE_EXCLUDE_PATHS = {
+    p.strip() for p in os.getenv("PROFILE_EXCLUDE_PATHS", "/api/match-requests/events,/metrics").split(",") if p.strip()
+}
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+PROFILE_SUFFIX = ".collapsed"
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or bool(PROFILE_ADMIN_TOKEN)
+
+
+# 이 프레임에서 멈춰 있는 스레드는 일감을 기다리는 중이므로 세지 않음 (이벤트 루프 스레드 제외)
+IDLE_LEAF_FRAMES = {
+    ("_worker", "thread.py"), ("wait", "threading.py"), ("_wait_for_tstate_lock", "threading.py"),
+    ("select", "selectors.py"),
+}
+
+
+class StackSampler:
+    """스레드 스택을 주기적으로 읽어 collapsed stack 별로 셈
+
+    thread_id 스레드는 항상, 나머지 스레드는 일하는 중일 때만 센다.
+    """
+
+    def __init__(self, thread_id: int, interval_seconds: float):
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.counts = Counter()
+        self._labels = {}  # {code 객체: 프레임 이름}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            # collapsed 형식에서 ';' 는 프레임 구분자, 공백 뒤 숫자는 개수
+            filename = os.path.basename(code.co_filename)
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval_seconds):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if thread_id != self.thread_id and (code.co_name, os.path.basename(code.co_filename)) in IDLE_LEAF_FRAMES:
+                    continue
+                if thread_id not in names:
+                    names.update((t.ident, t.name.replace(";", ":").replace(" ", "_")) for t in threading.enumerate())
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class ProfileStore:
+    """프로파일 파일 링 - 최대 개수를 넘으면 가장 오래된 파일부터 삭제"""
+
+    def __init__(self, directory: str = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._files = None  # 처음 저장할 때 기존 파일 목록을 읽음
+
+    def _load(self):
+        os.makedirs(self.directory, exist_ok=True)
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(PROFILE_SUFFIX))
+        self._files = deque(os.path.join(self.directory, name) for name in names)
+
+    def save(self, name: str, content: str) -> str:
+        with self._lock:
+            if self._files is None:
+                self._load()
+            path = os.path.join(self.directory, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            self._files.append(path)
+            while len(self._files) > self.max_files:
+                try:
+                    os.remove(self._files.popleft())
+                except FileNotFoundError:
+                    pass
+            return path
+
+
+class ProfilingMiddleware:
+    """선택된 요청을 StackSampler 로 감싸는 ASGI 미들웨어
+
+    관리자 헤더로 요청한 경우 응답의 X-Profile-Id 헤더에 파일 이름을 담는다.
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE, admin_token: str = PROFILE_ADMIN_TOKEN,
+                 store: ProfileStore = None, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token.encode()
+        self.store = store or ProfileStore()
+        self.interval_seconds = interval_ms / 1000
+        self._active = False  # 이벤트 루프 스레드에서만 바뀜
+
+    def _requested_by_admin(self, scope) -> bool:
+        if not self.admin_token:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_TOKEN_HEADER:
+                return secrets.compare_digest(value, self.admin_token)
+        return False
+
+    def _finish(self, sampler: StackSampler, name: str):
+        """샘플러 스레드 종료 대기 + 파일 저장 - 이벤트 루프를 막지 않도록 워커 스레드에서 실행"""
+        sampler.stop()
+        self.store.save(name, sampler.collapsed())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active or scope["path"] in PROFILE_EXCLUDE_PATHS:
+            await self.app(scope, receive, send)
+            return
+        by_admin = self._requested_by_admin(scope)
+        if not by_admin and not (self.sample_rate > 0 and random.random() < self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        # 파일 이름이 시간 순으로 정렬되도록 나노초 시각을 앞에 둠
+        name = "{}-{}{}".format(
+            time.time_ns(), _UNSAFE_NAME.sub("_", f"{scope['method']}{scope['path']}").strip("_")[:80], PROFILE_SUFFIX
+        )
+
+        async def send_wrapper(message):
+            if by_admin and message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER, name.encode())]}
+            await send(message)
+
+        self._active = True
+        sampler = StackSampler(threading.get_ident(), self.interval_seconds)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            try:
+                await asyncio.to_thread(self._finish, sampler, name)
+            finally:
+                self._active = False
@@ -0,0 +1,31 @@
+"""
+빠른 JSON 응답 - 목록 API 용
+
+FastAPI 기본 경로는 반환값을 jsonable_encoder 로 한 번 훑어 변환한 뒤
+JSONResponse 가 json.dumps 로 다시 직렬화한다. FastJSONResponse 를 직접
+반환하면 변환 단계 없이 dict/list 를 바로 바이트로 만든다.
+orjson 이 없으면 표준 json 을 사용한다.
+"""
+from typing import Any
+from fastapi.responses import Response
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 사용
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """dict / list / str / int 등 JSON 기본 타입만 담은 content 를 그대로 직렬화"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
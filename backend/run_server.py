@@ -1,24 +1,119 @@
 #!/usr/bin/env python3
 """
 서버 실행 스크립트
+
+개발 모드 (기본): 워커 1개, uvicorn 기본 설정
+운영 모드: 워커 여러 개 + uvloop/httptools + backlog/keep-alive/종료 대기 시간 설정
+
+    python3 run_server.py
+    STORAGE_BACKEND=sqlite python3 run_server.py --mode production --workers 4
+
+워커는 서로 다른 프로세스이므로 워커가 2개 이상이면 모든 워커가 같은 데이터를
+보도록 STORAGE_BACKEND=sqlite 가 필요하다 (id 는 SQLite AUTOINCREMENT 로 발급).
+SSE 이벤트는 각 워커가 SQLite 의 요청 변경을 version 순으로 읽어 (events.ChangeFeed)
+다른 워커에 연결된 구독자에게도 전달된다 (최대 EVENT_FEED_INTERVAL_MS 지연).
+/metrics 지표는 워커마다 따로 수집되고 합쳐지지 않는다 (metrics.py 참고).
 """
-import uvicorn
-import sys
+import argparse
+import importlib.util
 import os
+import sys
+
+import uvicorn
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def pick(choice: str, module: str, fallback: str) -> str:
+    """auto 이면 module 이 설치되어 있을 때 module, 없으면 fallback"""
+    if choice != "auto":
+        return choice
+    return module if importlib.util.find_spec(module) is not None else fallback
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mentor-Mentee API 서버 실행")
+    parser.add_argument("--mode", choices=["dev", "production"], default=os.getenv("SERVER_MODE", "dev"))
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=env_int("PORT", 8080))
+    parser.add_argument("--workers", type=int, default=env_int("WEB_CONCURRENCY", 0),
+                        help="워커 프로세스 수 (운영 모드 전용, 기본값: CPU 코어 수)")
+    parser.add_argument("--loop", choices=["auto", "uvloop", "asyncio"], default=os.getenv("SERVER_LOOP", "auto"))
+    parser.add_argument("--http", choices=["auto", "httptools", "h11"], default=os.getenv("SERVER_HTTP", "auto"))
+    parser.add_argument("--backlog", type=int, default=env_int("SERVER_BACKLOG", 2048), help="listen 대기열 크기")
+    parser.add_argument("--keep-alive", type=int, default=env_int("SERVER_KEEP_ALIVE", 5),
+                        help="keep-alive 연결 유지 시간 (초)")
+    parser.add_argument("--graceful-timeout", type=int, default=env_int("SERVER_GRACEFUL_TIMEOUT", 30),
+                        help="종료 신호 후 처리 중인 요청을 기다리는 최대 시간 (초)")
+    parser.add_argument("--limit-concurrency", type=int, default=env_int("SERVER_LIMIT_CONCURRENCY", 0),
+                        help="워커당 동시 연결 상한 (넘으면 503, 0 이면 제한 없음)")
+    parser.add_argument("--access-log", action=argparse.BooleanOptionalAction, default=None,
+                        help="접근 로그 (기본값: 개발 모드만 켬)")
+    return parser.parse_args()
+
+
+def production_options(args) -> dict:
+    from events import EVENT_FEED_INTERVAL_MS
+    from storage import SQLITE_PATH, STORAGE_BACKEND, SQLiteRepository
+
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1 and STORAGE_BACKEND != "sqlite":
+        raise SystemExit(
+            f"❌ {workers} workers need shared storage: set STORAGE_BACKEND=sqlite "
+            f"(current: {STORAGE_BACKEND}) or use --workers 1"
+        )
+    if workers > 1 and EVENT_FEED_INTERVAL_MS <= 0:
+        raise SystemExit(
+            f"❌ {workers} workers need EVENT_FEED_INTERVAL_MS > 0 to deliver events across workers "
+            f"or use --workers 1"
+        )
+    if STORAGE_BACKEND == "sqlite":
+        # 워커들이 동시에 스키마를 만들지 않도록 먼저 한 번 생성
+        SQLiteRepository(SQLITE_PATH, pool_size=1)
+
+    return {
+        "workers": workers,
+        "loop": pick(args.loop, "uvloop", "asyncio"),
+        "http": pick(args.http, "httptools", "h11"),
+        "backlog": args.backlog,
+        "timeout_keep_alive": args.keep_alive,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+        "limit_concurrency": args.limit_concurrency or None,
+        "access_log": bool(args.access_log),
+        "proxy_headers": True,
+        "server_header": False,
+    }
+
 
 if __name__ == "__main__":
     # 현재 디렉토리를 sys.path에 추가
     current_dir = os.path.dirname(os.path.abspath(__file__))
     sys.path.insert(0, current_dir)
-    
-    print("🚀 Starting FastAPI server...")
+
+    args = parse_args()
+    options = {}
+    if args.mode == "production":
+        options = production_options(args)
+        print("🚀 Starting FastAPI server (production: {workers} workers, loop={loop}, http={http})...".format(**options))
+    else:
+        if args.workers > 1:
+            raise SystemExit(
+                f"❌ --workers {args.workers} (or WEB_CONCURRENCY) is only used with --mode production; "
+                f"dev mode runs a single worker"
+            )
+        if args.access_log is not None:
+            options["access_log"] = args.access_log
+        print("🚀 Starting FastAPI server...")
     try:
         uvicorn.run(
             "main:app",
-            host="0.0.0.0",
-            port=8080,
+            host=args.host,
+            port=args.port,
             reload=False,
-            log_level="info"
+            log_level="info",
+            **options
         )
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
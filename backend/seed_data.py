@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+대규모 시드 데이터 생성기 - 회원가입 API 와 사용자별 bcrypt 없이 저장소에 직접 적재
+
+같은 옵션과 seed 면 항상 같은 데이터가 만들어진다 (비밀번호 해시의 salt 제외).
+    - 스킬 인기도: Zipf 분포 (--skill-zipf 0 이면 균등)
+    - 요청 대상 멘토: Zipf 분포로 인기 멘토에 요청이 몰림 (--mentor-zipf)
+    - 멘티별 요청 수: 평균이 --fanout 인 기하 분포
+    - 요청 상태: --status-weights 비율 (멘토마다 수락은 최대 1건, 수락한 멘토에게는 대기 요청 없음.
+      이 제약으로 맞출 수 없는 비율은 request_status_mix 에 실제 비율로 나옴)
+    - 이미지: --image-ratio 비율의 사용자에게 --image-variants 종류의 합성 이미지
+      (내용 해시로 저장되므로 같은 이미지는 한 번만 보관)
+비밀번호 해시는 한 번만 계산해서 모든 사용자가 같은 비밀번호(--password)를 쓴다.
+
+사용법:
+    python3 seed_data.py --users 100000
+    STORAGE_BACKEND=sqlite SQLITE_PATH=seed.db python3 seed_data.py --users 1000000 --image-ratio 0.1
+"""
+from itertools import accumulate
+from typing import Dict, List, Optional
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PASSWORD = "password123"
+IMAGE_URL = "/api/images/{role}/{id}"  # 프로필 이미지 업로드 (PUT /api/profile/image) 와 같은 형식
+BASE_SKILLS = [
+    "React", "Vue", "Python", "FastAPI", "Spring Boot", "Kubernetes", "Go", "Rust", "AWS", "Docker",
+    "TypeScript", "Node.js", "Django", "PostgreSQL", "Redis", "Kafka", "Android", "iOS", "ML", "Figma",
+]
+DEFAULT_STATUS_WEIGHTS = {"pending": 6, "rejected": 2, "cancelled": 1, "accepted": 1}
+
+
+def zipf_cum_weights(count: int, exponent: float) -> List[float]:
+    """1/k^s 가중치의 누적합 - random.choices(cum_weights=...) 용"""
+    return list(accumulate(1.0 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def skill_names(count: int) -> List[str]:
+    return BASE_SKILLS[:count] + [f"Skill{i}" for i in range(len(BASE_SKILLS), count)]
+
+
+def geometric(rng: random.Random, mean: float) -> int:
+    """평균이 mean 인 기하 분포 (0 이상)"""
+    if mean <= 0:
+        return 0
+    return int(rng.expovariate(math.log1p(1.0 / mean)))
+
+
+def synthetic_images(rng: random.Random, count: int) -> List[Dict[str, dict]]:
+    """단색 이미지 count 개를 업로드와 같은 정규화 과정으로 변환"""
+    from io import BytesIO
+    from PIL import Image
+    from images import IMAGE_MIN_DIMENSION, normalize_image
+
+    variants = []
+    for _ in range(count):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        buffer = BytesIO()
+        Image.new("RGB", (IMAGE_MIN_DIMENSION, IMAGE_MIN_DIMENSION), color).save(buffer, format="PNG")
+        variants.append(normalize_image(buffer.getvalue()))
+    return variants
+
+
+def request_statuses(rng: random.Random, pairs: List[tuple], status_weights: Dict[str, float]) -> List[str]:
+    """(멘토 위치, 멘티 위치) 요청마다 상태 결정
+
+    API 로 만들 수 있는 상태만 나오도록 수락한 멘토는 수락 1건 + 나머지는 대기가 아닌 상태
+    (rejected, cancelled 등) 이다. 수락할 멘토를 요청이 적은 멘토부터 먼저 고르되, 남은 멘토의
+    요청만으로 대기 목표 수를 채울 수 있을 때만 고른다. 남은 요청은 전체 비율이 status_weights 에 맞도록
+    다시 나눈 비율로 뽑는다. 멘토 수가 모자라 수락 목표를 못 채우면 그만큼 다른 닫힌 상태가 늘어난다.
+    """
+    total = len(pairs)
+    weight_sum = sum(status_weights.values())
+    pending_target = round(total * status_weights.get("pending", 0) / weight_sum)
+    accepted_target = round(total * status_weights.get("accepted", 0) / weight_sum)
+    closed = [s for s, weight in status_weights.items() if s not in ("pending", "accepted") and weight > 0]
+    closed_cum_weights = list(accumulate(status_weights[s] for s in closed))
+
+    rows_by_mentor = {}
+    for row, (mentor_index, _) in enumerate(pairs):
+        rows_by_mentor.setdefault(mentor_index, []).append(row)
+
+    statuses = [None] * total
+    open_rows = total
+    accepted = 0
+    candidates = sorted(rows_by_mentor)
+    rng.shuffle(candidates)
+    # 요청이 적은 멘토부터 (같으면 무작위) - 대기 목표를 지키면서 수락 목표에 가장 가깝게
+    candidates.sort(key=lambda mentor_index: len(rows_by_mentor[mentor_index]))
+    for mentor_index in candidates:
+        if accepted >= accepted_target:
+            break
+        rows = rows_by_mentor[mentor_index]
+        if open_rows - len(rows) < pending_target or (len(rows) > 1 and not closed):
+            continue
+        accepted_row = rng.choice(rows)
+        for row in rows:
+            statuses[row] = "accepted" if row == accepted_row else rng.choices(closed, cum_weights=closed_cum_weights)[0]
+        open_rows -= len(rows)
+        accepted += 1
+
+    pending_ratio = pending_target / open_rows if open_rows and closed else 1.0
+    for row in range(total):
+        if statuses[row] is None:
+            if rng.random() < pending_ratio:
+                statuses[row] = "pending"
+            else:
+                statuses[row] = rng.choices(closed, cum_weights=closed_cum_weights)[0]
+    return statuses
+
+
+def generate(
+    users: int = 10000,
+    mentor_ratio: float = 0.2,
+    skills: int = 50,
+    skill_zipf: float = 1.1,
+    max_skills: int = 3,
+    fanout: float = 3.0,
+    mentor_zipf: float = 1.0,
+    status_weights: Optional[Dict[str, float]] = None,
+    image_ratio: float = 0.0,
+    image_variants: int = 8,
+    password_hash: str = "",
+    seed: int = 1,
+):
+    """bulk_load 인자 (users, match_requests, images) 생성"""
+    rng = random.Random(seed)
+    status_weights = status_weights or DEFAULT_STATUS_WEIGHTS
+    mentor_count = max(1, round(users * mentor_ratio)) if users else 0
+    mentee_count = users - mentor_count
+
+    vocabulary = skill_names(skills)
+    skill_weights = zipf_cum_weights(len(vocabulary), skill_zipf)
+
+    user_rows = []
+    for i in range(mentor_count):
+        picked = []
+        for skill in rng.choices(vocabulary, cum_weights=skill_weights, k=rng.randint(1, max_skills)):
+            if skill not in picked:
+                picked.append(skill)
+        name = f"멘토{i}"
+        user_rows.append((f"mentor{i}@example.com", password_hash, name, "mentor", {
+            "name": name,
+            "bio": f"{', '.join(picked)} 멘토링을 합니다.",
+            "imageUrl": "https://placehold.co/500x500.jpg?text=MENTOR",
+            "skills": picked,
+        }))
+    for i in range(mentee_count):
+        name = f"멘티{i}"
+        user_rows.append((f"mentee{i}@example.com", password_hash, name, "mentee", {
+            "name": name,
+            "bio": "",
+            "imageUrl": "https://placehold.co/500x500.jpg?text=MENTEE",
+        }))
+
+    # 멘토 인기 순위는 id 순서와 무관하게 섞음
+    mentor_ranking = list(range(mentor_count))
+    rng.shuffle(mentor_ranking)
+    mentor_weights = zipf_cum_weights(mentor_count, mentor_zipf) if mentor_count else []
+
+    pairs = []
+    for mentee_index in range(mentor_count, users):
+        wanted = min(geometric(rng, fanout), mentor_count)
+        targets = set()
+        # 인기 멘토가 겹치면 다시 뽑되, 무한히 돌지 않도록 시도 횟수 제한
+        for _ in range(wanted * 4):
+            if len(targets) == wanted:
+                break
+            targets.add(rng.choices(mentor_ranking, cum_weights=mentor_weights)[0])
+        pairs.extend((mentor_index, mentee_index) for mentor_index in sorted(targets))
+    request_rows = [
+        (mentor_index, mentee_index, "멘토링 부탁드립니다!", status)
+        for (mentor_index, mentee_index), status in zip(pairs, request_statuses(rng, pairs, status_weights))
+    ]
+
+    image_rows = []
+    if image_ratio > 0 and users:
+        pool = synthetic_images(rng, image_variants)
+        for user_index in range(users):
+            if rng.random() < image_ratio:
+                image_rows.append((user_index, rng.choice(pool)))
+
+    return user_rows, request_rows, image_rows
+
+
+def seed_repository(repo, password: str = DEFAULT_PASSWORD, **options) -> dict:
+    """시드 데이터 생성 + 저장소 적재
+
+    반환값: {"user_ids", "users", "stats"} - users 는 bulk_load 에 넘긴 (email, hash, name, role, profile)
+    """
+    from auth import get_password_hash
+
+    started = time.perf_counter()
+    password_hash = get_password_hash(password)
+    hash_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    users, match_requests, images = generate(password_hash=password_hash, **options)
+    generate_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    # 이미지 URL 은 id 가 정해진 뒤에야 알 수 있으므로 bulk_load 가 채움
+    user_ids = repo.bulk_load(users, match_requests, images, image_url=IMAGE_URL)
+    load_seconds = time.perf_counter() - started
+
+    status_counts = {}
+    for _, _, _, status in match_requests:
+        status_counts[status] = status_counts.get(status, 0) + 1
+    return {
+        "user_ids": user_ids,
+        "users": users,
+        "stats": {
+            "users": len(users),
+            "mentors": sum(1 for user in users if user[3] == "mentor"),
+            "match_requests": len(match_requests),
+            "request_status": status_counts,
+            "request_status_mix": {
+                status: round(count / len(match_requests), 3) for status, count in sorted(status_counts.items())
+            },
+            "images": len(images),
+            "hash_seconds": round(hash_seconds, 3),
+            "generate_seconds": round(generate_seconds, 3),
+            "load_seconds": round(load_seconds, 3),
+        },
+    }
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대규모 시드 데이터 생성")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--mentor-ratio", type=float, default=0.2)
+    parser.add_argument("--skills", type=int, default=50, help="스킬 종류 수")
+    parser.add_argument("--skill-zipf", type=float, default=1.1, help="스킬 인기도 Zipf 지수 (0 이면 균등)")
+    parser.add_argument("--max-skills", type=int, default=3, help="멘토당 최대 스킬 수")
+    parser.add_argument("--fanout", type=float, default=3.0, help="멘티당 평균 요청 수")
+    parser.add_argument("--mentor-zipf", type=float, default=1.0, help="요청 대상 멘토 인기도 Zipf 지수")
+    parser.add_argument("--status-weights", type=parse_weights, default=DEFAULT_STATUS_WEIGHTS,
+                        help="요청 상태 비율 (예: pending=6,rejected=2,cancelled=1,accepted=1)")
+    parser.add_argument("--image-ratio", type=float, default=0.0, help="이미지를 가진 사용자 비율")
+    parser.add_argument("--image-variants", type=int, default=8, help="합성 이미지 종류 수")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from storage import STORAGE_BACKEND, create_repository
+
+    result = seed_repository(
+        create_repository(),
+        password=args.password,
+        users=args.users,
+        mentor_ratio=args.mentor_ratio,
+        skills=args.skills,
+        skill_zipf=args.skill_zipf,
+        max_skills=args.max_skills,
+        fanout=args.fanout,
+        mentor_zipf=args.mentor_zipf,
+        status_weights=args.status_weights,
+        image_ratio=args.image_ratio,
+        image_variants=args.image_variants,
+        seed=args.seed,
+    )
+    print(json.dumps({"backend": STORAGE_BACKEND, "seed": args.seed, **result["stats"]}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@
 """
 import requests
 import json
+import os
+import queue
+import threading
 import time
 import sys
 import traceback
@@ -11,6 +14,8 @@ from datetime import datetime
 
 BASE_URL = "http://localhost:8080"
 API_BASE_URL = f"{BASE_URL}/api"
+# 같은 SQLite 파일을 쓰는 두 번째 서버 프로세스 (여러 워커 사이 이벤트 전달 테스트용, 없으면 건너뜀)
+SECOND_BASE_URL = os.getenv("SECOND_BASE_URL")
 
 def write_result(filename, content):
     """결과를 파일에 저장"""
@@ -18,6 +23,53 @@ def write_result(filename, content):
         f.write(content)
     print(f"✅ 결과 저장: {filename}")
 
+def signup_and_login(email, name, role, password="password123"):
+    """회원가입 + 로그인 -> (로그인 응답 JSON, 인증 헤더, 사용자 id)"""
+    requests.post(f"{API_BASE_URL}/signup", json={
+        "email": email, "password": password, "name": name, "role": role
+    }, timeout=10)
+    response = requests.post(f"{API_BASE_URL}/login", json={"email": email, "password": password}, timeout=10)
+    login = response.json()
+    headers = {"Authorization": f"Bearer {login.get('token')}"}
+    user_id = requests.get(f"{API_BASE_URL}/me", headers=headers, timeout=5).json()['id']
+    return login, headers, user_id
+
+def read_events(response, events):
+    """SSE 응답의 match-request 이벤트 data 를 events 큐에 넣음 (백그라운드 스레드에서 실행)"""
+    event = None
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:") and event == "match-request":
+                events.put(json.loads(line[len("data:"):]))
+            elif not line:
+                event = None
+    except Exception:
+        pass  # 테스트가 끝나 연결을 닫음
+
+def open_event_stream(headers, api_base_url=API_BASE_URL):
+    """스트림 티켓 발급 + 이벤트 스트림 연결 -> (응답, 이벤트 큐)"""
+    ticket = requests.post(f"{api_base_url}/match-requests/events/ticket", headers=headers, timeout=5).json()['ticket']
+    response = requests.get(f"{api_base_url}/match-requests/events", params={"ticket": ticket},
+                            stream=True, timeout=(5, 30))
+    events = queue.Queue()
+    if response.status_code == 200:
+        threading.Thread(target=read_events, args=(response, events), daemon=True).start()
+    return response, events
+
+def wait_for_event(events, request_id, timeout=5):
+    """request_id 요청의 이벤트를 timeout 초 안에 받으면 그 이벤트, 아니면 None"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            event = events.get(timeout=max(deadline - time.time(), 0.01))
+        except queue.Empty:
+            return None
+        if event['request']['id'] == request_id:
+            return event
+    return None
+
 def test_server_connection():
     """서버 연결 테스트"""
     print("🔗 서버 연결 테스트 중...")
@@ -177,6 +229,92 @@ def test_profile_api(tokens):
     
     return results
 
+def test_image_metadata(tokens):
+    """프로필 이미지 메타데이터 제거 테스트 - JPEG 주석/EXIF 가 원본과 썸네일에 남지 않아야 함"""
+    print("🖼️ 이미지 메타데이터 제거 테스트 중...")
+    results = []
+    
+    try:
+        import base64
+        from io import BytesIO
+        from PIL import Image
+        
+        if 'mentee' in tokens and tokens['mentee']:
+            headers = {"Authorization": f"Bearer {tokens['mentee']}"}
+            user_id = requests.get(f"{API_BASE_URL}/me", headers=headers, timeout=5).json()['id']
+            
+            secret = b"GPS 37.56,126.97 owner=alice"
+            exif = Image.Exif()
+            exif[0x010F] = "SecretCamera"  # Make
+            buffer = BytesIO()
+            Image.new("RGB", (500, 500), (30, 60, 90)).save(
+                buffer, format="JPEG", comment=secret, exif=exif.tobytes()
+            )
+            response = requests.put(f"{API_BASE_URL}/profile", headers=headers, json={
+                "id": user_id,
+                "name": "테스트멘티",
+                "role": "mentee",
+                "bio": "",
+                "image": base64.b64encode(buffer.getvalue()).decode()
+            }, timeout=10)
+            if response.status_code != 200:
+                results.append(f"❌ 이미지 업로드 실패: {response.status_code}")
+                return results
+            
+            for query, label in (("", "원본"), ("?size=64", "64px 썸네일")):
+                response = requests.get(f"{API_BASE_URL}/images/mentee/{user_id}{query}", headers=headers, timeout=5)
+                image = Image.open(BytesIO(response.content))
+                leaked = [key for key in ("comment", "exif") if key in image.info]
+                if secret in response.content or b"SecretCamera" in response.content:
+                    leaked.append("raw bytes")
+                if response.status_code == 200 and not leaked:
+                    results.append(f"✅ {label}에 주석/EXIF 없음")
+                else:
+                    results.append(f"❌ {label} 메타데이터 남음: {response.status_code} {leaked}")
+                
+    except Exception as e:
+        results.append(f"❌ 이미지 메타데이터 테스트 오류: {str(e)}")
+    
+    return results
+
+def test_malformed_multipart(tokens):
+    """형식이 깨진 multipart 업로드는 500 이 아니라 400 이어야 함"""
+    print("📦 잘못된 multipart 업로드 테스트 중...")
+    results = []
+    
+    try:
+        if 'mentee' in tokens and tokens['mentee']:
+            headers = {
+                "Authorization": f"Bearer {tokens['mentee']}",
+                "Content-Type": "multipart/form-data; boundary=XYZ"
+            }
+            bodies = {
+                "경계 문자열 없음": b"no boundary here",
+                "잘못된 헤더 줄": b"--XYZ\r\nbad header line\r\n\r\n",
+            }
+            for label, body in bodies.items():
+                response = requests.put(f"{API_BASE_URL}/profile/image", headers=headers, data=body, timeout=5)
+                if response.status_code == 400:
+                    results.append(f"✅ {label}: 400")
+                else:
+                    results.append(f"❌ {label}: {response.status_code} (400 이어야 함)")
+            
+            # Content-Length 없이 (chunked) 큰 파트 헤더를 보내면 파일 크기 제한과 별개로 거부해야 함
+            def huge_headers():
+                yield b"--XYZ\r\n"
+                for i in range(6):
+                    yield b"X-Padding-%d: %s\r\n" % (i, b"a" * 4000)
+            response = requests.put(f"{API_BASE_URL}/profile/image", headers=headers, data=huge_headers(), timeout=10)
+            if response.status_code == 400 and "headers too large" in response.text:
+                results.append("✅ 너무 큰 파트 헤더: 400")
+            else:
+                results.append(f"❌ 너무 큰 파트 헤더: {response.status_code} {response.text} (400 이어야 함)")
+                
+    except Exception as e:
+        results.append(f"❌ 잘못된 multipart 테스트 오류: {str(e)}")
+    
+    return results
+
 def test_mentor_list(tokens):
     """멘토 리스트 API 테스트"""
     print("👥 멘토 리스트 API 테스트 중...")
@@ -269,6 +407,356 @@ def test_match_requests(tokens):
     
     return results
 
+def test_concurrent_accept(mentee_count=10):
+    """동시 수락 스트레스 테스트 - 한 멘토에게 온 요청을 동시에 수락하면 하나만 성공해야 함"""
+    print("⚡ 동시 수락 테스트 중...")
+    results = []
+    
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        suffix = int(time.time() * 1000)
+        
+        _, mentor_headers, mentor_id = signup_and_login(
+            f"stress_mentor_{suffix}@example.com", "동시성멘토", "mentor", password="password123"
+        )
+        
+        request_ids = []
+        for i in range(mentee_count):
+            _, mentee_headers, mentee_id = signup_and_login(
+                f"stress_mentee_{suffix}_{i}@example.com", f"동시성멘티{i}", "mentee", password="password123"
+            )
+            response = requests.post(f"{API_BASE_URL}/match-requests", headers=mentee_headers, json={
+                "mentorId": mentor_id, "menteeId": mentee_id, "message": "동시성 테스트"
+            }, timeout=5)
+            request_ids.append(response.json()['id'])
+        
+        def accept(request_id):
+            return requests.put(
+                f"{API_BASE_URL}/match-requests/{request_id}/accept", headers=mentor_headers, timeout=10
+            ).status_code
+        
+        with ThreadPoolExecutor(max_workers=mentee_count) as executor:
+            status_codes = list(executor.map(accept, request_ids))
+        
+        accepted = status_codes.count(200)
+        if accepted == 1:
+            results.append(f"✅ 동시 수락 {mentee_count}건 중 1건만 성공")
+        else:
+            results.append(f"❌ 동시 수락 {mentee_count}건 중 {accepted}건 성공 (1건이어야 함)")
+        
+        response = requests.get(f"{API_BASE_URL}/match-requests/incoming", headers=mentor_headers, timeout=5)
+        statuses = [r['status'] for r in response.json()]
+        if statuses.count("accepted") == 1 and statuses.count("rejected") == mentee_count - 1:
+            results.append("✅ 수락 1건, 나머지는 모두 자동 거절")
+        else:
+            results.append(f"❌ 요청 상태 불일치: {statuses}")
+    
+    except Exception as e:
+        results.append(f"❌ 동시 수락 테스트 오류: {str(e)}")
+    
+    return results
+
+def test_batch_match_requests():
+    """일괄 처리 테스트 - 항목별 상태 코드가 단건 API 와 같고, 요청 순서대로 적용되어야 함"""
+    print("📦 매칭 요청 일괄 처리 테스트 중...")
+    results = []
+    
+    try:
+        suffix = int(time.time() * 1000)
+        _, mentor_headers, mentor_id = signup_and_login(f"batch_mentor_{suffix}@example.com", "일괄멘토", "mentor")
+        _, _, other_mentor_id = signup_and_login(f"batch_mentor2_{suffix}@example.com", "다른멘토", "mentor")
+        
+        mentees = []
+        request_ids = []
+        for i in range(3):
+            _, headers, mentee_id = signup_and_login(f"batch_mentee_{suffix}_{i}@example.com", f"일괄멘티{i}", "mentee")
+            mentees.append((headers, mentee_id))
+            response = requests.post(f"{API_BASE_URL}/match-requests", headers=headers, json={
+                "mentorId": mentor_id, "menteeId": mentee_id, "message": "일괄 처리 테스트"
+            }, timeout=5)
+            request_ids.append(response.json()['id'])
+        headers, mentee_id = mentees[0]
+        other_request_id = requests.post(f"{API_BASE_URL}/match-requests", headers=headers, json={
+            "mentorId": other_mentor_id, "menteeId": mentee_id, "message": "다른 멘토에게"
+        }, timeout=5).json()['id']
+        
+        operations = [
+            {"id": request_ids[1], "action": "reject"},    # 200
+            {"id": request_ids[0], "action": "accept"},    # 200 (나머지 대기 요청 자동 거절)
+            {"id": request_ids[2], "action": "accept"},    # 400 (이미 자동 거절됨)
+            {"id": request_ids[2], "action": "cancel"},    # 403 (멘토는 취소 불가)
+            {"id": other_request_id, "action": "reject"},  # 403 (다른 멘토의 요청)
+            {"id": 99999999, "action": "reject"},          # 404
+        ]
+        expected = [200, 200, 400, 403, 403, 404]
+        response = requests.post(f"{API_BASE_URL}/match-requests/batch", headers=mentor_headers,
+                                 json={"operations": operations}, timeout=10)
+        if response.status_code != 200:
+            results.append(f"❌ 일괄 처리 실패: {response.status_code}")
+            return results
+        items = response.json()
+        statuses = [item['status'] for item in items]
+        if statuses == expected and [item['id'] for item in items] == [op['id'] for op in operations]:
+            results.append(f"✅ 항목별 상태 코드 일치: {statuses}")
+        else:
+            results.append(f"❌ 항목별 상태 코드 불일치: {statuses} (기대값 {expected})")
+        if items[1].get('request', {}).get('status') == "accepted":
+            results.append("✅ 성공 항목에 변경된 요청 포함")
+        else:
+            results.append(f"❌ 성공 항목의 요청 정보 이상: {items[1]}")
+        
+        response = requests.get(f"{API_BASE_URL}/match-requests/incoming", headers=mentor_headers, timeout=5)
+        status_by_id = {r['id']: r['status'] for r in response.json()}
+        actual = [status_by_id.get(request_id) for request_id in request_ids]
+        if actual == ["accepted", "rejected", "rejected"]:
+            results.append("✅ 일괄 처리 후 요청 상태 반영")
+        else:
+            results.append(f"❌ 일괄 처리 후 요청 상태 불일치: {actual}")
+        
+        # 역할이 맞으면 멘티도 일괄 취소 가능 (다른 멘토의 대기 요청)
+        response = requests.post(f"{API_BASE_URL}/match-requests/batch", headers=headers,
+                                 json={"operations": [{"id": other_request_id, "action": "cancel"}]}, timeout=5)
+        if response.status_code == 200 and response.json()[0]['status'] == 200:
+            results.append("✅ 멘티 일괄 취소 성공")
+        else:
+            results.append(f"❌ 멘티 일괄 취소 실패: {response.status_code} {response.text}")
+    
+    except Exception as e:
+        results.append(f"❌ 일괄 처리 테스트 오류: {str(e)}")
+    
+    return results
+
+def test_delta_sync():
+    """증분 조회 테스트 - since 이후 생성/변경된 요청만 오고 X-Sync-Version 이 증가해야 함"""
+    print("🔁 요청 목록 증분 조회 테스트 중...")
+    results = []
+    
+    try:
+        suffix = int(time.time() * 1000)
+        _, mentor_headers, mentor_id = signup_and_login(f"sync_mentor_{suffix}@example.com", "동기화멘토", "mentor")
+        mentees = [
+            signup_and_login(f"sync_mentee_{suffix}_{i}@example.com", f"동기화멘티{i}", "mentee")[1:]
+            for i in range(2)
+        ]
+        
+        def create_request(headers, mentee_id):
+            return requests.post(f"{API_BASE_URL}/match-requests", headers=headers, json={
+                "mentorId": mentor_id, "menteeId": mentee_id, "message": "증분 조회 테스트"
+            }, timeout=5).json()['id']
+        
+        def incoming(since=None):
+            params = {} if since is None else {"since": since}
+            response = requests.get(f"{API_BASE_URL}/match-requests/incoming", headers=mentor_headers,
+                                    params=params, timeout=5)
+            return response.json(), int(response.headers["X-Sync-Version"])
+        
+        first_id = create_request(*mentees[0])
+        items, version = incoming()
+        if [r['id'] for r in items] == [first_id]:
+            results.append(f"✅ 전체 조회 (version {version})")
+        else:
+            results.append(f"❌ 전체 조회 결과 이상: {items}")
+        
+        items, same_version = incoming(version)
+        if items == [] and same_version == version:
+            results.append("✅ 변경이 없으면 빈 목록, 같은 version")
+        else:
+            results.append(f"❌ 변경 없는 증분 조회 이상: {items}, {same_version}")
+        
+        second_id = create_request(*mentees[1])
+        items, new_version = incoming(version)
+        if [r['id'] for r in items] == [second_id] and new_version > version:
+            results.append("✅ 새로 생성된 요청만 반환")
+        else:
+            results.append(f"❌ 생성 후 증분 조회 이상: {items}, {new_version}")
+        
+        requests.put(f"{API_BASE_URL}/match-requests/{first_id}/reject", headers=mentor_headers, timeout=5)
+        items, latest_version = incoming(new_version)
+        if [(r['id'], r['status']) for r in items] == [(first_id, "rejected")] and latest_version > new_version:
+            results.append("✅ 상태가 바뀐 요청만 반환")
+        else:
+            results.append(f"❌ 상태 변경 후 증분 조회 이상: {items}, {latest_version}")
+        
+        mentee_headers, _ = mentees[0]
+        response = requests.get(f"{API_BASE_URL}/match-requests/outgoing", headers=mentee_headers, timeout=5)
+        mentee_version = int(response.headers["X-Sync-Version"])
+        response = requests.get(f"{API_BASE_URL}/match-requests/outgoing", headers=mentee_headers,
+                                params={"since": mentee_version}, timeout=5)
+        if response.status_code == 200 and response.json() == []:
+            results.append("✅ 보낸 요청 증분 조회 (변경 없음)")
+        else:
+            results.append(f"❌ 보낸 요청 증분 조회 이상: {response.status_code} {response.text}")
+        
+        response = requests.get(f"{API_BASE_URL}/match-requests/incoming", headers=mentor_headers,
+                                params={"since": -1}, timeout=5)
+        if response.status_code == 422:
+            results.append("✅ 음수 since 거부 (422)")
+        else:
+            results.append(f"❌ 음수 since 응답: {response.status_code}")
+        
+        response = requests.get(f"{API_BASE_URL}/match-requests/incoming", headers=mentor_headers,
+                                params={"since": 10**20}, timeout=5)
+        if response.status_code == 422:
+            results.append("✅ 범위를 벗어난 since 거부 (422)")
+        else:
+            results.append(f"❌ 범위를 벗어난 since 응답: {response.status_code}")
+    
+    except Exception as e:
+        results.append(f"❌ 증분 조회 테스트 오류: {str(e)}")
+    
+    return results
+
+def test_event_stream():
+    """이벤트 스트림 테스트 - 티켓은 한 번만 (동시에 써도) 통하고 요청 변경이 스트림으로 와야 함"""
+    print("📡 이벤트 스트림 테스트 중...")
+    results = []
+    
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        suffix = int(time.time() * 1000)
+        _, mentor_headers, mentor_id = signup_and_login(f"sse_mentor_{suffix}@example.com", "스트림멘토", "mentor")
+        _, mentee_headers, mentee_id = signup_and_login(f"sse_mentee_{suffix}@example.com", "스트림멘티", "mentee")
+        
+        ticket = requests.post(f"{API_BASE_URL}/match-requests/events/ticket",
+                               headers=mentor_headers, timeout=5).json()['ticket']
+        response = requests.get(f"{API_BASE_URL}/me", headers={"Authorization": f"Bearer {ticket}"}, timeout=5)
+        if response.status_code == 401:
+            results.append("✅ 스트림 티켓은 액세스 토큰으로 쓸 수 없음 (401)")
+        else:
+            results.append(f"❌ 스트림 티켓으로 API 접근: {response.status_code}")
+        
+        def connect(_):
+            return requests.get(f"{API_BASE_URL}/match-requests/events", params={"ticket": ticket},
+                                stream=True, timeout=(5, 30))
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(connect, range(8)))
+        status_codes = [r.status_code for r in responses]
+        if status_codes.count(200) == 1 and status_codes.count(401) == 7:
+            results.append("✅ 같은 티켓으로 동시에 8번 연결 -> 1번만 성공")
+        else:
+            results.append(f"❌ 같은 티켓 동시 연결 결과: {status_codes}")
+        for r in responses:
+            r.close()
+        
+        stream, events = open_event_stream(mentor_headers)
+        try:
+            request_id = requests.post(f"{API_BASE_URL}/match-requests", headers=mentee_headers, json={
+                "mentorId": mentor_id, "menteeId": mentee_id, "message": "스트림 테스트"
+            }, timeout=5).json()['id']
+            event = wait_for_event(events, request_id)
+            if event and event['type'] == "created":
+                results.append("✅ 요청 생성 이벤트 수신")
+            else:
+                results.append(f"❌ 요청 생성 이벤트 미수신: {event}")
+        finally:
+            stream.close()
+    
+    except Exception as e:
+        results.append(f"❌ 이벤트 스트림 테스트 오류: {str(e)}")
+    
+    return results
+
+def test_cross_worker_events():
+    """워커 간 이벤트 테스트 - 한 서버 프로세스에서 바꾼 요청이 다른 프로세스의 스트림으로 와야 함"""
+    print("🔀 워커 간 이벤트 전달 테스트 중...")
+    results = []
+    
+    if not SECOND_BASE_URL:
+        results.append("⚠️ SECOND_BASE_URL 미설정 - 건너뜀 (같은 SQLITE_PATH 로 띄운 두 번째 서버 주소)")
+        return results
+    
+    try:
+        second_api_base_url = f"{SECOND_BASE_URL}/api"
+        suffix = int(time.time() * 1000)
+        _, mentor_headers, mentor_id = signup_and_login(f"xw_mentor_{suffix}@example.com", "워커멘토", "mentor")
+        _, mentee_headers, mentee_id = signup_and_login(f"xw_mentee_{suffix}@example.com", "워커멘티", "mentee")
+        
+        # 멘토는 두 번째 프로세스에, 멘티는 첫 번째 프로세스에 연결
+        mentor_stream, mentor_events = open_event_stream(mentor_headers, second_api_base_url)
+        mentee_stream, mentee_events = open_event_stream(mentee_headers)
+        try:
+            if mentor_stream.status_code != 200 or mentee_stream.status_code != 200:
+                results.append(f"❌ 스트림 연결 실패: {mentor_stream.status_code}, {mentee_stream.status_code}")
+                return results
+            
+            request_id = requests.post(f"{API_BASE_URL}/match-requests", headers=mentee_headers, json={
+                "mentorId": mentor_id, "menteeId": mentee_id, "message": "워커 간 이벤트 테스트"
+            }, timeout=5).json()['id']
+            event = wait_for_event(mentor_events, request_id)
+            if event and event['type'] == "created":
+                results.append("✅ 다른 프로세스에서 만든 요청의 생성 이벤트 수신")
+            else:
+                results.append(f"❌ 다른 프로세스의 생성 이벤트 미수신: {event}")
+            
+            event = wait_for_event(mentee_events, request_id)
+            if event and event['type'] == "created":
+                results.append("✅ 같은 프로세스의 생성 이벤트 수신")
+            else:
+                results.append(f"❌ 같은 프로세스의 생성 이벤트 미수신: {event}")
+            
+            requests.put(f"{second_api_base_url}/match-requests/{request_id}/accept",
+                         headers=mentor_headers, timeout=5)
+            event = wait_for_event(mentee_events, request_id)
+            if event and event['type'] == "accepted":
+                results.append("✅ 다른 프로세스에서 수락한 이벤트 수신")
+            else:
+                results.append(f"❌ 다른 프로세스의 수락 이벤트 미수신: {event}")
+            
+            event = wait_for_event(mentor_events, request_id)
+            extra = wait_for_event(mentor_events, request_id, timeout=1)
+            if event and event['type'] == "accepted" and extra is None:
+                results.append("✅ 같은 프로세스의 수락 이벤트는 한 번만 수신")
+            else:
+                results.append(f"❌ 같은 프로세스의 수락 이벤트 이상: {event}, 중복 {extra}")
+        finally:
+            mentor_stream.close()
+            mentee_stream.close()
+    
+    except Exception as e:
+        results.append(f"❌ 워커 간 이벤트 테스트 오류: {str(e)}")
+    
+    return results
+
+def test_out_of_range_ids():
+    """범위를 벗어난 id 테스트 - SQLite INTEGER 를 넘는 id 는 500 이 아니라 422 로 거부해야 함"""
+    print("🔢 범위를 벗어난 id 테스트 중...")
+    results = []
+    
+    try:
+        suffix = int(time.time() * 1000)
+        huge = 10**20
+        _, mentor_headers, _ = signup_and_login(f"range_mentor_{suffix}@example.com", "범위멘토", "mentor")
+        _, mentee_headers, mentee_id = signup_and_login(f"range_mentee_{suffix}@example.com", "범위멘티", "mentee")
+        
+        checks = [
+            ("요청 수락", requests.put(f"{API_BASE_URL}/match-requests/{huge}/accept",
+                                       headers=mentor_headers, timeout=5)),
+            ("요청 거절", requests.put(f"{API_BASE_URL}/match-requests/{huge}/reject",
+                                       headers=mentor_headers, timeout=5)),
+            ("요청 취소", requests.delete(f"{API_BASE_URL}/match-requests/{huge}",
+                                          headers=mentee_headers, timeout=5)),
+            ("프로필 이미지", requests.get(f"{API_BASE_URL}/images/mentor/{huge}",
+                                           headers=mentee_headers, timeout=5)),
+            ("요청 생성", requests.post(f"{API_BASE_URL}/match-requests", headers=mentee_headers, json={
+                "mentorId": huge, "menteeId": mentee_id, "message": "범위 테스트"
+            }, timeout=5)),
+            ("일괄 처리", requests.post(f"{API_BASE_URL}/match-requests/batch", headers=mentor_headers,
+                                        json={"operations": [{"id": huge, "action": "reject"}]}, timeout=5)),
+        ]
+        for name, response in checks:
+            if response.status_code == 422:
+                results.append(f"✅ {name}: 범위를 벗어난 id 거부 (422)")
+            else:
+                results.append(f"❌ {name}: 범위를 벗어난 id 응답 {response.status_code}")
+    
+    except Exception as e:
+        results.append(f"❌ 범위를 벗어난 id 테스트 오류: {str(e)}")
+    
+    return results
+
 def test_jwt_claims(tokens):
     """JWT 클레임 검증 테스트"""
     print("🔐 JWT 클레임 검증 테스트 중...")
@@ -352,6 +840,127 @@ def test_jwt_claims(tokens):
     
     return results
 
+def test_logout_revocation():
+    """로그아웃 테스트 - 로그아웃한 액세스 토큰은 만료 전이라도 거부되어야 함"""
+    print("🚪 로그아웃 / 토큰 폐기 테스트 중...")
+    results = []
+    
+    try:
+        suffix = int(time.time() * 1000)
+        email = f"logout_{suffix}@example.com"
+        _, headers, _ = signup_and_login(email, "로그아웃멘티", "mentee")
+        
+        response = requests.get(f"{API_BASE_URL}/me", headers=headers, timeout=5)
+        if response.status_code == 200:
+            results.append("✅ 로그아웃 전 토큰 사용 가능")
+        else:
+            results.append(f"❌ 로그아웃 전 토큰 거부: {response.status_code}")
+        
+        response = requests.post(f"{API_BASE_URL}/logout", headers=headers, timeout=5)
+        if response.status_code == 200:
+            results.append("✅ 로그아웃 성공")
+        else:
+            results.append(f"❌ 로그아웃 실패: {response.status_code}")
+        
+        response = requests.get(f"{API_BASE_URL}/me", headers=headers, timeout=5)
+        if response.status_code == 401:
+            results.append("✅ 로그아웃한 토큰 거부 (401)")
+        else:
+            results.append(f"❌ 로그아웃한 토큰 허용: {response.status_code}")
+        
+        response = requests.post(f"{API_BASE_URL}/logout", headers=headers, timeout=5)
+        if response.status_code == 401:
+            results.append("✅ 폐기된 토큰으로 다시 로그아웃 불가 (401)")
+        else:
+            results.append(f"❌ 폐기된 토큰으로 로그아웃 응답: {response.status_code}")
+        
+        # 다른 로그인 세션의 토큰은 영향 없음
+        _, other_headers, _ = signup_and_login(email, "로그아웃멘티", "mentee")
+        response = requests.get(f"{API_BASE_URL}/me", headers=other_headers, timeout=5)
+        if response.status_code == 200:
+            results.append("✅ 새로 로그인한 토큰은 사용 가능")
+        else:
+            results.append(f"❌ 새로 로그인한 토큰 거부: {response.status_code}")
+    
+    except Exception as e:
+        results.append(f"❌ 로그아웃 테스트 오류: {str(e)}")
+    
+    return results
+
+def test_refresh_tokens():
+    """리프레시 토큰 테스트 - 교체 발급, 재사용 감지 시 family 전체 폐기, 로그아웃 시 폐기"""
+    print("🔄 리프레시 토큰 테스트 중...")
+    results = []
+    
+    def refresh(refresh_token):
+        return requests.post(f"{API_BASE_URL}/token/refresh", json={"refreshToken": refresh_token}, timeout=5)
+    
+    try:
+        suffix = int(time.time() * 1000)
+        email = f"refresh_{suffix}@example.com"
+        login, _, _ = signup_and_login(email, "리프레시멘티", "mentee")
+        first = login.get('refreshToken')
+        if first:
+            results.append("✅ 로그인 응답에 refreshToken 포함")
+        else:
+            results.append("❌ 로그인 응답에 refreshToken 없음")
+            return results
+        
+        response = refresh(first)
+        second = response.json().get('refreshToken') if response.status_code == 200 else None
+        if second and second != first:
+            results.append("✅ 리프레시 성공, 새 리프레시 토큰으로 교체")
+        else:
+            results.append(f"❌ 리프레시 실패: {response.status_code}")
+            return results
+        
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        response = requests.get(f"{API_BASE_URL}/me", headers=headers, timeout=5)
+        if response.status_code == 200 and response.json().get('email') == email:
+            results.append("✅ 재발급된 액세스 토큰으로 조회 성공")
+        else:
+            results.append(f"❌ 재발급된 액세스 토큰 거부: {response.status_code}")
+        
+        response = refresh(second)
+        third = response.json().get('refreshToken') if response.status_code == 200 else None
+        if third:
+            results.append("✅ 교체된 리프레시 토큰으로 다시 리프레시 성공")
+        else:
+            results.append(f"❌ 교체된 리프레시 토큰 리프레시 실패: {response.status_code}")
+        
+        # 이미 사용한 토큰 재사용 -> 거부 + 같은 로그인의 최신 토큰까지 폐기
+        response = refresh(first)
+        if response.status_code == 401:
+            results.append("✅ 사용한 리프레시 토큰 재사용 거부 (401)")
+        else:
+            results.append(f"❌ 사용한 리프레시 토큰 재사용 허용: {response.status_code}")
+        response = refresh(third)
+        if response.status_code == 401:
+            results.append("✅ 재사용 감지 후 같은 로그인의 최신 토큰도 폐기 (401)")
+        else:
+            results.append(f"❌ 재사용 감지 후 최신 토큰 허용: {response.status_code}")
+        
+        # 로그아웃할 때 보낸 리프레시 토큰은 더 이상 사용 불가
+        login, headers, _ = signup_and_login(email, "리프레시멘티", "mentee")
+        requests.post(f"{API_BASE_URL}/logout", headers=headers,
+                      json={"refreshToken": login['refreshToken']}, timeout=5)
+        response = refresh(login['refreshToken'])
+        if response.status_code == 401:
+            results.append("✅ 로그아웃한 리프레시 토큰 거부 (401)")
+        else:
+            results.append(f"❌ 로그아웃한 리프레시 토큰 허용: {response.status_code}")
+        
+        response = refresh("not-a-real-token")
+        if response.status_code == 401:
+            results.append("✅ 잘못된 리프레시 토큰 거부 (401)")
+        else:
+            results.append(f"❌ 잘못된 리프레시 토큰 응답: {response.status_code}")
+    
+    except Exception as e:
+        results.append(f"❌ 리프레시 토큰 테스트 오류: {str(e)}")
+    
+    return results
+
 def test_security_requirements():
     """보안 요구사항 테스트"""
     print("🛡️ 보안 요구사항 테스트 중...")
@@ -471,6 +1080,16 @@ def run_all_tests():
     all_results.append("\n👤 프로필 API 테스트:")
     all_results.extend([f"   {r}" for r in results])
     
+    # 4-1. 이미지 메타데이터 제거 테스트
+    results = test_image_metadata(tokens)
+    all_results.append("\n🖼️ 이미지 메타데이터 제거 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
+    # 4-2. 잘못된 multipart 업로드 테스트
+    results = test_malformed_multipart(tokens)
+    all_results.append("\n📦 잘못된 multipart 업로드 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
     # 5. 멘토 리스트 테스트
     results = test_mentor_list(tokens)
     all_results.append("\n👥 멘토 리스트 API 테스트:")
@@ -481,11 +1100,51 @@ def run_all_tests():
     all_results.append("\n🤝 매칭 요청 API 테스트:")
     all_results.extend([f"   {r}" for r in results])
     
+    # 6-1. 동시 수락 테스트
+    results = test_concurrent_accept()
+    all_results.append("\n⚡ 동시 수락 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
+    # 6-2. 일괄 처리 테스트
+    results = test_batch_match_requests()
+    all_results.append("\n📦 매칭 요청 일괄 처리 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
+    # 6-3. 증분 조회 테스트
+    results = test_delta_sync()
+    all_results.append("\n🔁 요청 목록 증분 조회 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
+    # 6-4. 이벤트 스트림 테스트
+    results = test_event_stream()
+    all_results.append("\n📡 이벤트 스트림 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
+    # 6-5. 워커 간 이벤트 전달 테스트
+    results = test_cross_worker_events()
+    all_results.append("\n🔀 워커 간 이벤트 전달 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
+    # 6-6. 범위를 벗어난 id 테스트
+    results = test_out_of_range_ids()
+    all_results.append("\n🔢 범위를 벗어난 id 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
     # 7. JWT 클레임 검증 테스트
     results = test_jwt_claims(tokens)
     all_results.append("\n🔐 JWT 클레임 검증 테스트:")
     all_results.extend([f"   {r}" for r in results])
     
+    # 7-1. 로그아웃 / 토큰 폐기 테스트
+    results = test_logout_revocation()
+    all_results.append("\n🚪 로그아웃 / 토큰 폐기 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
+    # 7-2. 리프레시 토큰 테스트
+    results = test_refresh_tokens()
+    all_results.append("\n🔄 리프레시 토큰 테스트:")
+    all_results.extend([f"   {r}" for r in results])
+    
     # 8. 보안 요구사항 테스트
     results = test_security_requirements()
     all_results.append("\n🛡️ 보안 요구사항 테스트:")
@@ -0,0 +1,1205 @@
+"""
+저장소 계층 - 메모리 / SQLite 구현
+
+STORAGE_BACKEND 환경변수로 선택한다.
+    memory (기본값): 프로세스 메모리에 저장 (테스트용, 재시작 시 초기화)
+    sqlite: SQLITE_PATH 파일에 저장 (WAL 모드, 여러 워커 프로세스에서 공유 가능)
+
+API 는 AsyncRepository 로 감싸서 await 로 호출한다. SQLite 호출은 전용 스레드에서
+실행하므로 다른 워커의 쓰기 잠금을 기다리는 동안에도 이벤트 루프가 막히지 않는다.
+"""
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import functools
+import heapq
+import json
+import os
+import queue
+import sqlite3
+import time
+
+from images import ImageCache
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "mentor_mentee.db")
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+MENTOR_ORDERS = ("id", "name", "skill")
+
+
+def normalize_email(email: str) -> str:
+    """이메일 인덱스 키 (대소문자 무시)"""
+    return email.strip().casefold()
+
+
+def check_bulk_positions(user_count: int, match_requests, images):
+    """bulk_load 의 요청/이미지 행이 가리키는 사용자 위치가 users 범위 안인지 확인"""
+    for mentor_index, mentee_index, _, _ in match_requests:
+        if not (0 <= mentor_index < user_count and 0 <= mentee_index < user_count):
+            raise ValueError(f"Match request refers to unknown user position: {mentor_index}, {mentee_index}")
+    for user_index, _ in images:
+        if not 0 <= user_index < user_count:
+            raise ValueError(f"Image refers to unknown user position: {user_index}")
+
+
+def skill_sort_key(profile: dict) -> str:
+    return ",".join(profile.get("skills", []))
+
+
+class Repository(ABC):
+    """API 가 사용하는 저장소 인터페이스
+
+    사용자/요청 데이터는 dict 로 주고받는다:
+        user: {"id", "email", "password", "name", "role"}
+        profile: {"name", "bio", "imageUrl", ("skills")}
+        match_request: {"id", "mentorId", "menteeId", "message", "status", "version"}
+
+    version 은 요청이 생성되거나 상태가 바뀔 때마다 전체 요청에서 단조 증가하는 값
+    """
+
+    # 사용자
+    @abstractmethod
+    def get_user(self, user_id: int) -> Optional[dict]: ...
+
+    @abstractmethod
+    def get_user_by_email(self, email: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    def create_user(self, email: str, password_hash: str, name: str, role: str,
+                    profile: dict) -> Optional[dict]:
+        """사용자 + 프로필 생성 - 이메일이 이미 있으면 None"""
+
+    @abstractmethod
+    def update_password_hash(self, user_id: int, password_hash: str):
+        """로그인 시 새 해시 설정으로 다시 만든 해시 저장"""
+
+    @abstractmethod
+    def get_profile(self, user_id: int) -> dict: ...
+
+    @abstractmethod
+    def update_profile(self, user_id: int, name: str, profile: dict): ...
+
+    # 멘토 목록
+    @abstractmethod
+    def list_mentors(self, skill: Optional[str], order: str, after: Optional[tuple] = None,
+                     limit: Optional[int] = None) -> List[Tuple[tuple, dict]]:
+        """[(정렬키 (key, id), 멘토)] - 정렬키는 페이지 커서로 사용"""
+
+    # 이미지 - 내용 해시(digest)로 저장해서 같은 이미지는 한 번만 보관
+    @abstractmethod
+    def get_image(self, user_id: int, variant: str = "original") -> Optional[dict]:
+        """{"digest", "media_type", "data", "updated_at"} 또는 None
+
+        요청한 변형(썸네일)이 없으면 원본을 반환
+        """
+
+    @abstractmethod
+    def save_image(self, user_id: int, variants: Dict[str, dict]):
+        """{변형 이름: {"digest", "media_type", "data"}} 로 사용자 이미지 교체"""
+
+    # 매칭 요청
+    @abstractmethod
+    def get_match_request(self, request_id: int) -> Optional[dict]: ...
+
+    @abstractmethod
+    def get_match_requests(self, request_ids: List[int]) -> Dict[int, dict]:
+        """여러 요청을 한 번에 조회 -> {id: 요청} (없는 id 는 빠짐)"""
+
+    @abstractmethod
+    def has_pending_request(self, mentee_id: int, mentor_id: int) -> bool: ...
+
+    @abstractmethod
+    def create_match_request(self, mentor_id: int, mentee_id: int, message: str) -> Optional[dict]:
+        """대기 요청 생성 - 같은 (멘티, 멘토) 대기 요청이 이미 있으면 None"""
+
+    @abstractmethod
+    def list_requests_for_mentor(self, mentor_id: int, since: Optional[int] = None) -> Tuple[List[dict], int]:
+        """멘토의 요청 목록 + 현재 최고 version
+
+        since 가 없으면 전체 (id 순), 있으면 version 이 since 보다 큰 요청만 (version 순)
+        """
+
+    @abstractmethod
+    def list_requests_for_mentee(self, mentee_id: int, since: Optional[int] = None) -> Tuple[List[dict], int]:
+        """list_requests_for_mentor 와 같은 규칙의 멘티 요청 목록"""
+
+    @abstractmethod
+    def get_request_version(self) -> int:
+        """현재 최고 요청 version"""
+
+    @abstractmethod
+    def list_request_changes(self, since: int) -> List[dict]:
+        """version 이 since 보다 큰 모든 요청 (version 순) - 워커 프로세스 사이 변경 전달용"""
+
+    @abstractmethod
+    def set_request_status(self, request_id: int, status: str) -> dict: ...
+
+    @abstractmethod
+    def accept_match_request(self, request_id: int) -> Optional[List[dict]]:
+        """대기 중인 요청 수락 + 같은 멘토의 다른 대기 요청 자동 거절
+
+        확인과 변경을 한 번에 수행하고, 바뀐 요청 목록 [수락한 요청, *자동 거절된 요청] 반환
+        요청이 이미 대기 상태가 아니면 None
+        """
+
+    @abstractmethod
+    def apply_request_status_changes(self, changes: List[Tuple[int, str]]) -> List[Optional[List[dict]]]:
+        """[(request_id, 상태)] 를 순서대로 한 번에 적용 -> 변경별로 바뀐 요청 목록 (대상 요청이 첫 번째)
+
+        "accepted" 는 accept_match_request 와 같이 처리하고 대기 상태가 아니면 None
+        """
+
+    # 토큰 폐기 목록 - 만료 시각이 지난 항목은 자동 정리
+    @abstractmethod
+    def revoke_token(self, jti: str, expires_at: float): ...
+
+    @abstractmethod
+    def is_token_revoked(self, jti: str) -> bool: ...
+
+    @abstractmethod
+    def consume_token(self, jti: str, expires_at: float) -> bool:
+        """1회용 토큰 사용 - 폐기 목록에 원자적으로 등록, 이미 있었으면 False"""
+
+    # 리프레시 토큰 - 해시로 저장, 한 로그인에서 이어지는 토큰들은 family_id 로 묶음
+    @abstractmethod
+    def save_refresh_token(self, token_hash: str, family_id: str, user_id: int, expires_at: float): ...
+
+    @abstractmethod
+    def rotate_refresh_token(self, token_hash: str, new_token_hash: str, expires_at: float) -> Optional[int]:
+        """토큰을 사용됨으로 표시하고 같은 family 의 새 토큰 저장 -> user_id
+
+        없거나 만료된 토큰이면 None. 이미 사용된 토큰이 다시 오면 탈취로 보고
+        family 전체를 폐기한 뒤 None
+        """
+
+    @abstractmethod
+    def revoke_refresh_token(self, token_hash: str):
+        """토큰이 속한 family 전체 폐기 (로그아웃)"""
+
+    # 대량 적재 (시드 데이터)
+    @abstractmethod
+    def bulk_load(self, users: List[tuple], match_requests: List[tuple] = (),
+                  images: List[tuple] = (), image_url: Optional[str] = None) -> List[int]:
+        """사용자/요청/이미지를 한 번에 적재 -> users 순서대로 발급한 사용자 id
+
+        users: [(email, password_hash, name, role, profile)]
+        match_requests: [(멘토 위치, 멘티 위치, message, status)] - 위치는 users 안의 순서
+        images: [(사용자 위치, {변형 이름: 이미지})]
+        image_url: 이미지가 있는 사용자의 profile["imageUrl"] 형식 (예: "/api/images/{role}/{id}").
+            id 가 정해진 뒤 적재 전에 채우므로 사용자마다 프로필을 다시 저장하지 않는다.
+        보조 인덱스는 한 건씩 갱신하지 않고 마지막에 한 번에 만든다.
+        같은 (멘티, 멘토) 대기 요청은 하나만 있어야 하고, 이미 있는 이메일이나 users 범위를
+        벗어난 위치가 있으면 아무것도 적재하지 않고 ValueError
+        """
+
+
+class InMemoryRepository(Repository):
+    """프로세스 메모리 저장소 - 보조 인덱스를 함께 유지"""
+
+    def __init__(self):
+        self.users_db = {}  # {id: user_data}
+        self.profiles_db = {}  # {user_id: profile_data}
+        self.match_requests_db = {}  # {id: match_request_data}
+        self.images_db = {}  # {user_id: {변형 이름: digest}}
+        self.image_blobs = {}  # {digest: {"digest", "media_type", "data"}}
+        self.image_refs = {}  # {digest: 참조 수}
+        self.image_updated_at = {}  # {user_id: 이미지 변경 시각 (unix time)}
+        self.user_counter = 1
+        self.request_counter = 1
+        self.request_version = 0  # 마지막으로 발급한 요청 version
+
+        self.email_index = {}  # {정규화된 이메일: user_id}
+        self.mentor_skill_index = {}  # {소문자 스킬: set(mentor_id)}
+        self.mentor_skills = {}  # {mentor_id: set(소문자 스킬)}
+        self.mentor_sort_keys = {}  # {mentor_id: {정렬 기준: (정렬키, mentor_id)}}
+        self.mentor_orders = {order: [] for order in MENTOR_ORDERS}  # {정렬 기준: 정렬된 [(정렬키, mentor_id)]}
+        self.mentor_request_ids = {}  # {mentorId: [request_id]}
+        self.mentee_request_ids = {}  # {menteeId: [request_id]}
+        self.mentor_request_versions = {}  # {mentorId: OrderedDict(request_id)} version 순
+        self.mentee_request_versions = {}  # {menteeId: OrderedDict(request_id)} version 순
+        self.request_versions = OrderedDict()  # {request_id: None} 전체 요청 version 순
+        self.pending_pairs = set()  # {(menteeId, mentorId)} 대기중인 요청
+        self.mentor_pending_ids = {}  # {mentorId: set(대기중인 request_id)}
+        self.revoked_tokens = {}  # {jti: 토큰 만료 시각}
+        self.revoked_token_expiry = []  # [(토큰 만료 시각, jti)] 힙
+        self.refresh_tokens = {}  # {토큰 해시: {"user_id", "family_id", "expires_at", "used"}}
+        self.refresh_token_families = {}  # {family_id: set(토큰 해시)}
+        self.refresh_token_expiry = []  # [(만료 시각, 토큰 해시)] 힙
+
+    # 사용자
+    def get_user(self, user_id):
+        return self.users_db.get(user_id)
+
+    def get_user_by_email(self, email):
+        user_id = self.email_index.get(normalize_email(email))
+        if user_id is None:
+            return None
+        return self.users_db.get(user_id)
+
+    def create_user(self, email, password_hash, name, role, profile):
+        email_key = normalize_email(email)
+        if email_key in self.email_index:
+            return None
+
+        user_id = self.user_counter
+        self.user_counter += 1
+        user_data = {
+            "id": user_id,
+            "email": email,
+            "password": password_hash,
+            "name": name,
+            "role": role
+        }
+        self.users_db[user_id] = user_data
+        self.email_index[email_key] = user_id
+        self.profiles_db[user_id] = profile
+        if role == "mentor":
+            self._index_mentor(user_id, profile)
+        return user_data
+
+    def update_password_hash(self, user_id, password_hash):
+        self.users_db[user_id]["password"] = password_hash
+
+    def get_profile(self, user_id):
+        return self.profiles_db.get(user_id, {})
+
+    def update_profile(self, user_id, name, profile):
+        self.users_db[user_id]["name"] = name
+        self.profiles_db[user_id] = profile
+        if self.users_db[user_id]["role"] == "mentor":
+            self._index_mentor(user_id, profile)
+
+    @staticmethod
+    def _mentor_keys(user_id, profile):
+        # 같은 정렬키는 id 순으로 정렬됨
+        return {
+            "id": (user_id, user_id),
+            "name": (profile.get("name", ""), user_id),
+            "skill": (skill_sort_key(profile), user_id),
+        }
+
+    def _index_mentor(self, user_id, profile):
+        """멘토 스킬 인덱스와 정렬 목록을 증분 갱신"""
+        old_keys = self.mentor_sort_keys.get(user_id)
+        new_keys = self._mentor_keys(user_id, profile)
+        for order, new_key in new_keys.items():
+            entries = self.mentor_orders[order]
+            if old_keys is not None:
+                old_key = old_keys[order]
+                if old_key == new_key:
+                    continue
+                i = bisect_left(entries, old_key)
+                if i < len(entries) and entries[i] == old_key:
+                    del entries[i]
+            insort(entries, new_key)
+        self.mentor_sort_keys[user_id] = new_keys
+
+        old_skills = self.mentor_skills.get(user_id, set())
+        new_skills = {s.lower() for s in profile.get("skills") or []}
+        for skill in old_skills - new_skills:
+            mentor_ids = self.mentor_skill_index[skill]
+            mentor_ids.discard(user_id)
+            if not mentor_ids:
+                del self.mentor_skill_index[skill]
+        for skill in new_skills - old_skills:
+            self.mentor_skill_index.setdefault(skill, set()).add(user_id)
+        self.mentor_skills[user_id] = new_skills
+
+    # 멘토 목록
+    def list_mentors(self, skill, order, after=None, limit=None):
+        if skill:
+            mentor_ids = self.mentor_skill_index.get(skill.lower(), ())
+            entries = sorted(self.mentor_sort_keys[mentor_id][order] for mentor_id in mentor_ids)
+        else:
+            entries = self.mentor_orders[order]
+
+        # 커서 다음 위치부터 (정렬키, id)가 유일하므로 목록이 바뀌어도 안정적
+        start = bisect_right(entries, after) if after is not None else 0
+        end = start + limit if limit is not None else None
+
+        mentors = []
+        for entry in entries[start:end]:
+            user = self.users_db[entry[1]]
+            mentors.append((entry, {
+                "id": user["id"],
+                "email": user["email"],
+                "role": user["role"],
+                "profile": self.profiles_db.get(user["id"], {})
+            }))
+        return mentors
+
+    # 이미지
+    def get_image(self, user_id, variant="original"):
+        digests = self.images_db.get(user_id)
+        if not digests:
+            return None
+        digest = digests.get(variant, digests["original"])
+        return {**self.image_blobs[digest], "updated_at": self.image_updated_at[user_id]}
+
+    def save_image(self, user_id, variants):
+        old_digests = self.images_db.get(user_id, {})
+        new_digests = {name: image["digest"] for name, image in variants.items()}
+        if old_digests == new_digests:
+            return
+
+        for image in variants.values():
+            digest = image["digest"]
+            if digest not in self.image_blobs:
+                self.image_blobs[digest] = {
+                    "digest": digest, "media_type": image["media_type"], "data": image["data"]
+                }
+            self.image_refs[digest] = self.image_refs.get(digest, 0) + 1
+        self.images_db[user_id] = new_digests
+        self.image_updated_at[user_id] = time.time()
+
+        # 더 이상 참조되지 않는 이전 이미지 정리
+        for old_digest in old_digests.values():
+            self.image_refs[old_digest] -= 1
+            if not self.image_refs[old_digest]:
+                del self.image_refs[old_digest]
+                del self.image_blobs[old_digest]
+
+    # 매칭 요청
+    def get_match_request(self, request_id):
+        return self.match_requests_db.get(request_id)
+
+    def get_match_requests(self, request_ids):
+        return {i: self.match_requests_db[i] for i in request_ids if i in self.match_requests_db}
+
+    def has_pending_request(self, mentee_id, mentor_id):
+        return (mentee_id, mentor_id) in self.pending_pairs
+
+    def create_match_request(self, mentor_id, mentee_id, message):
+        if (mentee_id, mentor_id) in self.pending_pairs:
+            return None
+
+        request_id = self.request_counter
+        self.request_counter += 1
+        match_request = {
+            "id": request_id,
+            "mentorId": mentor_id,
+            "menteeId": mentee_id,
+            "message": message,
+            "status": "pending"
+        }
+        self._bump_request_version(match_request)
+        self.match_requests_db[request_id] = match_request
+        self.mentor_request_ids.setdefault(mentor_id, []).append(request_id)
+        self.mentee_request_ids.setdefault(mentee_id, []).append(request_id)
+        self.pending_pairs.add((mentee_id, mentor_id))
+        self.mentor_pending_ids.setdefault(mentor_id, set()).add(request_id)
+        return match_request
+
+    def _bump_request_version(self, match_request):
+        """새 version 발급 + 사용자별 version 순서 목록의 맨 뒤로 이동"""
+        self.request_version += 1
+        match_request["version"] = self.request_version
+        for index, user_id in (
+            (self.mentor_request_versions, match_request["mentorId"]),
+            (self.mentee_request_versions, match_request["menteeId"]),
+        ):
+            request_ids = index.setdefault(user_id, OrderedDict())
+            request_ids[match_request["id"]] = None
+            request_ids.move_to_end(match_request["id"])
+        self.request_versions[match_request["id"]] = None
+        self.request_versions.move_to_end(match_request["id"])
+
+    def _changes_since(self, request_versions, since):
+        # version 순 목록을 뒤에서부터 since 까지만 읽음 (바뀐 요청 수에 비례)
+        changed = []
+        for request_id in reversed(request_versions or ()):
+            match_request = self.match_requests_db[request_id]
+            if match_request["version"] <= since:
+                break
+            changed.append(match_request)
+        changed.reverse()
+        return changed
+
+    def _list_requests(self, request_ids, request_versions, since):
+        if since is None:
+            return [self.match_requests_db[i] for i in request_ids], self.request_version
+        return self._changes_since(request_versions, since), self.request_version
+
+    def list_requests_for_mentor(self, mentor_id, since=None):
+        return self._list_requests(
+            self.mentor_request_ids.get(mentor_id, ()), self.mentor_request_versions.get(mentor_id), since
+        )
+
+    def list_requests_for_mentee(self, mentee_id, since=None):
+        return self._list_requests(
+            self.mentee_request_ids.get(mentee_id, ()), self.mentee_request_versions.get(mentee_id), since
+        )
+
+    def get_request_version(self):
+        return self.request_version
+
+    def list_request_changes(self, since):
+        return self._changes_since(self.request_versions, since)
+
+    def set_request_status(self, request_id, status):
+        """요청 상태 변경 - 대기 인덱스도 함께 갱신"""
+        match_request = self.match_requests_db[request_id]
+        if match_request["status"] == "pending" and status != "pending":
+            mentor_id = match_request["mentorId"]
+            self.pending_pairs.discard((match_request["menteeId"], mentor_id))
+            pending_ids = self.mentor_pending_ids[mentor_id]
+            pending_ids.discard(request_id)
+            if not pending_ids:
+                del self.mentor_pending_ids[mentor_id]
+        if match_request["status"] != status:
+            match_request["status"] = status
+            self._bump_request_version(match_request)
+        return match_request
+
+    def accept_match_request(self, request_id):
+        match_request = self.match_requests_db[request_id]
+        if match_request["status"] != "pending":
+            return None
+        changed = [self.set_request_status(request_id, "accepted")]
+        # 전체 요청이 아니라 이 멘토의 대기 요청만 거절
+        for other_id in sorted(self.mentor_pending_ids.get(match_request["mentorId"], ())):
+            changed.append(self.set_request_status(other_id, "rejected"))
+        return changed
+
+    def apply_request_status_changes(self, changes):
+        return [
+            self.accept_match_request(request_id) if status == "accepted"
+            else [self.set_request_status(request_id, status)]
+            for request_id, status in changes
+        ]
+
+    # 토큰 폐기 목록
+    def revoke_token(self, jti, expires_at):
+        self.consume_token(jti, expires_at)
+
+    def is_token_revoked(self, jti):
+        return jti in self.revoked_tokens
+
+    def consume_token(self, jti, expires_at):
+        # 만료된 토큰은 어차피 검증에서 거절되므로 목록에서 제거
+        now = time.time()
+        while self.revoked_token_expiry and self.revoked_token_expiry[0][0] <= now:
+            _, expired_jti = heapq.heappop(self.revoked_token_expiry)
+            self.revoked_tokens.pop(expired_jti, None)
+        if jti in self.revoked_tokens:
+            return False
+        self.revoked_tokens[jti] = expires_at
+        heapq.heappush(self.revoked_token_expiry, (expires_at, jti))
+        return True
+
+    # 대량 적재
+    def _validate_bulk_load(self, users, match_requests, images):
+        """bulk_load 전에 모든 행 검사 - 중간에 실패해서 일부만 인덱싱되는 일이 없도록"""
+        check_bulk_positions(len(users), match_requests, images)
+        email_keys = set()
+        for email, _, _, _, _ in users:
+            email_key = normalize_email(email)
+            if email_key in self.email_index or email_key in email_keys:
+                raise ValueError(f"Email already registered: {email}")
+            email_keys.add(email_key)
+        pending_pairs = set()
+        for mentor_index, mentee_index, _, status in match_requests:
+            # 새 사용자끼리의 요청이므로 기존 대기 요청과는 겹칠 수 없음
+            if status == "pending":
+                if (mentee_index, mentor_index) in pending_pairs:
+                    raise ValueError(f"Duplicate pending request: mentee {mentee_index} -> mentor {mentor_index}")
+                pending_pairs.add((mentee_index, mentor_index))
+
+    def bulk_load(self, users, match_requests=(), images=(), image_url=None):
+        self._validate_bulk_load(users, match_requests, images)
+        user_ids = []
+        mentor_keys = {order: [] for order in MENTOR_ORDERS}
+        image_users = {user_index for user_index, _ in images} if image_url else ()
+        for user_index, (email, password_hash, name, role, profile) in enumerate(users):
+            email_key = normalize_email(email)
+            user_id = self.user_counter
+            self.user_counter += 1
+            if user_index in image_users:
+                profile["imageUrl"] = image_url.format(role=role, id=user_id)
+            self.users_db[user_id] = {
+                "id": user_id, "email": email, "password": password_hash, "name": name, "role": role
+            }
+            self.email_index[email_key] = user_id
+            self.profiles_db[user_id] = profile
+            user_ids.append(user_id)
+            if role == "mentor":
+                keys = self._mentor_keys(user_id, profile)
+                self.mentor_sort_keys[user_id] = keys
+                for order, key in keys.items():
+                    mentor_keys[order].append(key)
+                skills = {s.lower() for s in profile.get("skills") or []}
+                self.mentor_skills[user_id] = skills
+                for skill in skills:
+                    self.mentor_skill_index.setdefault(skill, set()).add(user_id)
+        # 정렬 목록은 insort 대신 마지막에 한 번 정렬
+        for order, keys in mentor_keys.items():
+            self.mentor_orders[order].extend(keys)
+            self.mentor_orders[order].sort()
+
+        for mentor_index, mentee_index, message, status in match_requests:
+            mentor_id = user_ids[mentor_index]
+            mentee_id = user_ids[mentee_index]
+            request_id = self.request_counter
+            self.request_counter += 1
+            match_request = {
+                "id": request_id, "mentorId": mentor_id, "menteeId": mentee_id, "message": message, "status": status
+            }
+            self._bump_request_version(match_request)
+            self.match_requests_db[request_id] = match_request
+            self.mentor_request_ids.setdefault(mentor_id, []).append(request_id)
+            self.mentee_request_ids.setdefault(mentee_id, []).append(request_id)
+            if status == "pending":
+                self.pending_pairs.add((mentee_id, mentor_id))
+                self.mentor_pending_ids.setdefault(mentor_id, set()).add(request_id)
+
+        for user_index, variants in images:
+            self.save_image(user_ids[user_index], variants)
+        return user_ids
+
+    # 리프레시 토큰
+    def save_refresh_token(self, token_hash, family_id, user_id, expires_at):
+        now = time.time()
+        while self.refresh_token_expiry and self.refresh_token_expiry[0][0] <= now:
+            _, expired_hash = heapq.heappop(self.refresh_token_expiry)
+            self._discard_refresh_token(expired_hash)
+        self.refresh_tokens[token_hash] = {
+            "user_id": user_id, "family_id": family_id, "expires_at": expires_at, "used": False
+        }
+        self.refresh_token_families.setdefault(family_id, set()).add(token_hash)
+        heapq.heappush(self.refresh_token_expiry, (expires_at, token_hash))
+
+    def _discard_refresh_token(self, token_hash):
+        token = self.refresh_tokens.pop(token_hash, None)
+        if token is None:
+            return
+        family = self.refresh_token_families[token["family_id"]]
+        family.discard(token_hash)
+        if not family:
+            del self.refresh_token_families[token["family_id"]]
+
+    def rotate_refresh_token(self, token_hash, new_token_hash, expires_at):
+        token = self.refresh_tokens.get(token_hash)
+        if token is None or token["expires_at"] <= time.time():
+            return None
+        if token["used"]:
+            self.revoke_refresh_token(token_hash)
+            return None
+        token["used"] = True
+        self.save_refresh_token(new_token_hash, token["family_id"], token["user_id"], expires_at)
+        return token["user_id"]
+
+    def revoke_refresh_token(self, token_hash):
+        token = self.refresh_tokens.get(token_hash)
+        if token is None:
+            return
+        for family_hash in list(self.refresh_token_families.get(token["family_id"], ())):
+            self._discard_refresh_token(family_hash)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    name TEXT NOT NULL,
+    role TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_role ON users(role, id);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id),
+    name TEXT NOT NULL,
+    bio TEXT NOT NULL,
+    image_url TEXT NOT NULL,
+    skills TEXT,
+    skill_key TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_name ON profiles(name, user_id);
+CREATE INDEX IF NOT EXISTS idx_profiles_skill_key ON profiles(skill_key, user_id);
+
+CREATE TABLE IF NOT EXISTS mentor_skills (
+    skill TEXT NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    PRIMARY KEY (skill, user_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS image_blobs (
+    digest TEXT PRIMARY KEY,
+    media_type TEXT NOT NULL,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS user_images (
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    variant TEXT NOT NULL,
+    digest TEXT NOT NULL REFERENCES image_blobs(digest),
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, variant)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_user_images_digest ON user_images(digest);
+
+CREATE TABLE IF NOT EXISTS match_requests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mentor_id INTEGER NOT NULL,
+    mentee_id INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    status TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_match_requests_mentor ON match_requests(mentor_id, id);
+CREATE INDEX IF NOT EXISTS idx_match_requests_mentee ON match_requests(mentee_id, id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_match_requests_pending
+    ON match_requests(mentee_id, mentor_id) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_match_requests_mentor_pending
+    ON match_requests(mentor_id) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_match_requests_version ON match_requests(version);
+CREATE INDEX IF NOT EXISTS idx_match_requests_mentor_version ON match_requests(mentor_id, version);
+CREATE INDEX IF NOT EXISTS idx_match_requests_mentee_version ON match_requests(mentee_id, version);
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires_at ON revoked_tokens(expires_at);
+
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    token_hash TEXT PRIMARY KEY,
+    family_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    expires_at REAL NOT NULL,
+    used INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_family ON refresh_tokens(family_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires_at ON refresh_tokens(expires_at);
+"""
+
+# 자주 쓰는 SQL - 파라미터 바인딩만 바뀌므로 커넥션별 statement 캐시에서 재사용됨
+SQL_USER_BY_ID = "SELECT id, email, password, name, role FROM users WHERE id = ?"
+SQL_USER_BY_EMAIL = "SELECT id, email, password, name, role FROM users WHERE email_key = ?"
+SQL_INSERT_USER = "INSERT INTO users (email, email_key, password, name, role) VALUES (?, ?, ?, ?, ?)"
+SQL_INSERT_USER_WITH_ID = "INSERT INTO users (id, email, email_key, password, name, role) VALUES (?, ?, ?, ?, ?, ?)"
+SQL_MAX_USER_ID = "SELECT COALESCE(MAX(id), 0) FROM users"
+SQL_UPDATE_USER_NAME = "UPDATE users SET name = ? WHERE id = ?"
+SQL_UPDATE_USER_PASSWORD = "UPDATE users SET password = ? WHERE id = ?"
+SQL_PROFILE = "SELECT name, bio, image_url, skills FROM profiles WHERE user_id = ?"
+SQL_UPSERT_PROFILE = (
+    "INSERT OR REPLACE INTO profiles (user_id, name, bio, image_url, skills, skill_key) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_DELETE_SKILLS = "DELETE FROM mentor_skills WHERE user_id = ?"
+SQL_INSERT_SKILL = "INSERT OR IGNORE INTO mentor_skills (skill, user_id) VALUES (?, ?)"
+# 요청한 변형이 없으면 원본 ('original' 이 뒤로 정렬되도록)
+SQL_USER_IMAGE = (
+    "SELECT i.digest, b.media_type, i.updated_at FROM user_images i JOIN image_blobs b ON b.digest = i.digest "
+    "WHERE i.user_id = ? AND i.variant IN (?, 'original') ORDER BY i.variant = 'original' LIMIT 1"
+)
+SQL_IMAGE_BLOB = "SELECT data FROM image_blobs WHERE digest = ?"
+SQL_INSERT_IMAGE_BLOB = "INSERT OR IGNORE INTO image_blobs (digest, media_type, data) VALUES (?, ?, ?)"
+SQL_USER_IMAGE_DIGESTS = "SELECT variant, digest FROM user_images WHERE user_id = ?"
+SQL_DELETE_USER_IMAGES = "DELETE FROM user_images WHERE user_id = ?"
+SQL_INSERT_USER_IMAGE = "INSERT INTO user_images (user_id, variant, digest, updated_at) VALUES (?, ?, ?, ?)"
+SQL_DELETE_UNUSED_IMAGE_BLOB = (
+    "DELETE FROM image_blobs WHERE digest = ? "
+    "AND NOT EXISTS (SELECT 1 FROM user_images WHERE digest = ?)"
+)
+SQL_MATCH_REQUEST = "SELECT id, mentor_id, mentee_id, message, status, version FROM match_requests WHERE id = ?"
+SQL_MATCH_REQUESTS_BY_IDS = (
+    "SELECT id, mentor_id, mentee_id, message, status, version FROM match_requests "
+    "WHERE id IN (SELECT value FROM json_each(?))"
+)
+SQL_HAS_PENDING = (
+    "SELECT 1 FROM match_requests WHERE mentee_id = ? AND mentor_id = ? AND status = 'pending'"
+)
+# 새 version = 현재 최고 version + 1 (쓰기 트랜잭션은 직렬화되므로 단조 증가)
+SQL_NEXT_REQUEST_VERSION = "(SELECT COALESCE(MAX(version), 0) + 1 FROM match_requests)"
+SQL_REQUEST_VERSION = "SELECT COALESCE(MAX(version), 0) FROM match_requests"
+SQL_INSERT_MATCH_REQUEST = (
+    "INSERT INTO match_requests (mentor_id, mentee_id, message, status, version) "
+    f"VALUES (?, ?, ?, 'pending', {SQL_NEXT_REQUEST_VERSION}) RETURNING id, version"
+)
+SQL_INSERT_MATCH_REQUEST_WITH_VERSION = (
+    "INSERT INTO match_requests (mentor_id, mentee_id, message, status, version) VALUES (?, ?, ?, ?, ?)"
+)
+SQL_REQUESTS_FOR_MENTOR = (
+    "SELECT id, mentor_id, mentee_id, message, status, version FROM match_requests WHERE mentor_id = ? ORDER BY id"
+)
+SQL_REQUESTS_FOR_MENTEE = (
+    "SELECT id, mentor_id, mentee_id, message, status, version FROM match_requests WHERE mentee_id = ? ORDER BY id"
+)
+SQL_REQUEST_CHANGES_FOR_MENTOR = (
+    "SELECT id, mentor_id, mentee_id, message, status, version FROM match_requests "
+    "WHERE mentor_id = ? AND version > ? ORDER BY version"
+)
+SQL_REQUEST_CHANGES_FOR_MENTEE = (
+    "SELECT id, mentor_id, mentee_id, message, status, version FROM match_requests "
+    "WHERE mentee_id = ? AND version > ? ORDER BY version"
+)
+SQL_REQUEST_CHANGES = (
+    "SELECT id, mentor_id, mentee_id, message, status, version FROM match_requests "
+    "WHERE version > ? ORDER BY version"
+)
+SQL_SET_REQUEST_STATUS = (
+    f"UPDATE match_requests SET status = ?, version = {SQL_NEXT_REQUEST_VERSION} WHERE id = ? AND status != ?"
+)
+SQL_ACCEPT_PENDING_REQUEST = (
+    f"UPDATE match_requests SET status = 'accepted', version = {SQL_NEXT_REQUEST_VERSION} "
+    "WHERE id = ? AND status = 'pending'"
+)
+# 함께 거절되는 요청들은 같은 version 을 받음
+SQL_REJECT_OTHER_PENDING = (
+    f"UPDATE match_requests SET status = 'rejected', version = {SQL_NEXT_REQUEST_VERSION} "
+    "WHERE mentor_id = ? AND id != ? AND status = 'pending' "
+    "RETURNING id, mentor_id, mentee_id, message, status, version"
+)
+SQL_REVOKE_TOKEN = "INSERT OR IGNORE INTO revoked_tokens (jti, expires_at) VALUES (?, ?)"
+SQL_PRUNE_REVOKED_TOKENS = "DELETE FROM revoked_tokens WHERE expires_at <= ?"
+SQL_IS_TOKEN_REVOKED = "SELECT 1 FROM revoked_tokens WHERE jti = ?"
+SQL_INSERT_REFRESH_TOKEN = (
+    "INSERT INTO refresh_tokens (token_hash, family_id, user_id, expires_at) VALUES (?, ?, ?, ?)"
+)
+SQL_PRUNE_REFRESH_TOKENS = "DELETE FROM refresh_tokens WHERE expires_at <= ?"
+SQL_REFRESH_TOKEN = "SELECT family_id, user_id, expires_at, used FROM refresh_tokens WHERE token_hash = ?"
+SQL_MARK_REFRESH_TOKEN_USED = "UPDATE refresh_tokens SET used = 1 WHERE token_hash = ?"
+SQL_DELETE_REFRESH_TOKEN_FAMILY = (
+    "DELETE FROM refresh_tokens WHERE family_id = "
+    "(SELECT family_id FROM refresh_tokens WHERE token_hash = ?)"
+)
+
+MENTOR_SORT_COLUMNS = {"id": "u.id", "name": "p.name", "skill": "p.skill_key"}
+
+
+def _mentor_list_sql(order: str, with_skill: bool, with_cursor: bool) -> str:
+    sort_column = MENTOR_SORT_COLUMNS[order]
+    sql = (
+        f"SELECT {sort_column}, u.id, u.email, u.role, p.name, p.bio, p.image_url, p.skills "
+        "FROM users u JOIN profiles p ON p.user_id = u.id "
+    )
+    if with_skill:
+        sql += "JOIN mentor_skills s ON s.user_id = u.id AND s.skill = ? "
+    sql += "WHERE u.role = 'mentor' "
+    if with_cursor:
+        sql += f"AND ({sort_column}, u.id) > (?, ?) "
+    return sql + f"ORDER BY {sort_column}, u.id LIMIT ?"
+
+
+SQL_LIST_MENTORS = {
+    (order, with_skill, with_cursor): _mentor_list_sql(order, with_skill, with_cursor)
+    for order in MENTOR_ORDERS
+    for with_skill in (False, True)
+    for with_cursor in (False, True)
+}
+
+
+def _user_from_row(row) -> Optional[dict]:
+    if row is None:
+        return None
+    return {"id": row[0], "email": row[1], "password": row[2], "name": row[3], "role": row[4]}
+
+
+def _profile_from_row(name, bio, image_url, skills) -> dict:
+    profile = {"name": name, "bio": bio, "imageUrl": image_url}
+    if skills is not None:
+        profile["skills"] = json.loads(skills)
+    return profile
+
+
+def _match_request_from_row(row) -> Optional[dict]:
+    if row is None:
+        return None
+    return {
+        "id": row[0], "mentorId": row[1], "menteeId": row[2], "message": row[3], "status": row[4], "version": row[5]
+    }
+
+
+class SQLiteRepository(Repository):
+    """SQLite 저장소 - WAL 모드 + 커넥션 풀
+
+    여러 uvicorn 워커 프로세스가 같은 파일을 공유할 수 있다.
+    id 는 AUTOINCREMENT, 이메일/대기 요청 중복은 UNIQUE 인덱스로 막는다.
+    """
+
+    def __init__(self, path: str = SQLITE_PATH, pool_size: int = SQLITE_POOL_SIZE):
+        self.path = path
+        self.pool_size = pool_size
+        self.image_cache = ImageCache()
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,  # 트랜잭션은 _transaction() 에서 명시적으로 시작
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 트랜잭션 - BEGIN IMMEDIATE 로 다른 프로세스의 쓰기와 직렬화"""
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def _snapshot(self):
+        """읽기 트랜잭션 - 안의 SELECT 들이 같은 시점의 데이터를 봄 (WAL)"""
+        with self._connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.execute("COMMIT")
+
+    # 사용자
+    def get_user(self, user_id):
+        with self._connection() as conn:
+            return _user_from_row(conn.execute(SQL_USER_BY_ID, (user_id,)).fetchone())
+
+    def get_user_by_email(self, email):
+        with self._connection() as conn:
+            return _user_from_row(conn.execute(SQL_USER_BY_EMAIL, (normalize_email(email),)).fetchone())
+
+    def create_user(self, email, password_hash, name, role, profile):
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute(
+                    SQL_INSERT_USER,
+                    (email, normalize_email(email), password_hash, name, role)
+                )
+                user_id = cursor.lastrowid
+                self._write_profile(conn, user_id, role, profile)
+        except sqlite3.IntegrityError:
+            return None
+        return {"id": user_id, "email": email, "password": password_hash, "name": name, "role": role}
+
+    def update_password_hash(self, user_id, password_hash):
+        with self._transaction() as conn:
+            conn.execute(SQL_UPDATE_USER_PASSWORD, (password_hash, user_id))
+
+    def get_profile(self, user_id):
+        with self._connection() as conn:
+            row = conn.execute(SQL_PROFILE, (user_id,)).fetchone()
+        if row is None:
+            return {}
+        return _profile_from_row(*row)
+
+    def update_profile(self, user_id, name, profile):
+        with self._transaction() as conn:
+            conn.execute(SQL_UPDATE_USER_NAME, (name, user_id))
+            role = conn.execute(SQL_USER_BY_ID, (user_id,)).fetchone()[4]
+            self._write_profile(conn, user_id, role, profile)
+
+    def _write_profile(self, conn, user_id, role, profile):
+        skills = profile.get("skills")
+        conn.execute(SQL_UPSERT_PROFILE, (
+            user_id,
+            profile["name"],
+            profile["bio"],
+            profile["imageUrl"],
+            json.dumps(skills, ensure_ascii=False) if skills is not None else None,
+            skill_sort_key(profile),
+        ))
+        if role == "mentor":
+            conn.execute(SQL_DELETE_SKILLS, (user_id,))
+            conn.executemany(SQL_INSERT_SKILL, [(s.lower(), user_id) for s in skills or []])
+
+    # 멘토 목록
+    def list_mentors(self, skill, order, after=None, limit=None):
+        params = []
+        if skill:
+            params.append(skill.lower())
+        if after is not None:
+            params.extend(after)
+        params.append(limit if limit is not None else -1)
+
+        sql = SQL_LIST_MENTORS[(order, bool(skill), after is not None)]
+        with self._connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        return [
+            ((sort_value, user_id), {
+                "id": user_id,
+                "email": email,
+                "role": role,
+                "profile": _profile_from_row(name, bio, image_url, skills)
+            })
+            for sort_value, user_id, email, role, name, bio, image_url, skills in rows
+        ]
+
+    # 이미지
+    def get_image(self, user_id, variant="original"):
+        with self._connection() as conn:
+            row = conn.execute(SQL_USER_IMAGE, (user_id, variant)).fetchone()
+            if row is None:
+                return None
+            digest, media_type, updated_at = row
+            # 내용 해시가 키이므로 캐시된 바이트는 항상 최신
+            data = self.image_cache.get(digest)
+            if data is None:
+                blob = conn.execute(SQL_IMAGE_BLOB, (digest,)).fetchone()
+                if blob is None:
+                    return None
+                data = bytes(blob[0])
+                self.image_cache.put(digest, data)
+        return {"digest": digest, "media_type": media_type, "data": data, "updated_at": updated_at}
+
+    def save_image(self, user_id, variants):
+        new_digests = {name: image["digest"] for name, image in variants.items()}
+        with self._transaction() as conn:
+            old_digests = dict(conn.execute(SQL_USER_IMAGE_DIGESTS, (user_id,)).fetchall())
+            if old_digests == new_digests:
+                return
+            now = time.time()
+            conn.execute(SQL_DELETE_USER_IMAGES, (user_id,))
+            for name, image in variants.items():
+                conn.execute(SQL_INSERT_IMAGE_BLOB, (image["digest"], image["media_type"], image["data"]))
+                conn.execute(SQL_INSERT_USER_IMAGE, (user_id, name, image["digest"], now))
+            # 더 이상 참조되지 않는 이전 이미지 정리
+            for old_digest in set(old_digests.values()) - set(new_digests.values()):
+                conn.execute(SQL_DELETE_UNUSED_IMAGE_BLOB, (old_digest, old_digest))
+        for image in variants.values():
+            self.image_cache.put(image["digest"], image["data"])
+
+    # 매칭 요청
+    def get_match_request(self, request_id):
+        with self._connection() as conn:
+            return _match_request_from_row(conn.execute(SQL_MATCH_REQUEST, (request_id,)).fetchone())
+
+    def get_match_requests(self, request_ids):
+        # id 개수와 관계없이 같은 SQL 을 쓰도록 JSON 배열 하나로 바인딩
+        with self._connection() as conn:
+            rows = conn.execute(SQL_MATCH_REQUESTS_BY_IDS, (json.dumps(list(request_ids)),)).fetchall()
+        return {row[0]: _match_request_from_row(row) for row in rows}
+
+    def has_pending_request(self, mentee_id, mentor_id):
+        with self._connection() as conn:
+            return conn.execute(SQL_HAS_PENDING, (mentee_id, mentor_id)).fetchone() is not None
+
+    def create_match_request(self, mentor_id, mentee_id, message):
+        try:
+            with self._transaction() as conn:
+                request_id, version = conn.execute(
+                    SQL_INSERT_MATCH_REQUEST, (mentor_id, mentee_id, message)
+                ).fetchone()
+        except sqlite3.IntegrityError:
+            return None
+        return {
+            "id": request_id,
+            "mentorId": mentor_id,
+            "menteeId": mentee_id,
+            "message": message,
+            "status": "pending",
+            "version": version
+        }
+
+    def _list_requests(self, user_id, since, sql_all, sql_changes):
+        # 목록과 최고 version 을 같은 스냅숏에서 읽어야 그 사이 변경을 놓치지 않음
+        with self._snapshot() as conn:
+            if since is None:
+                rows = conn.execute(sql_all, (user_id,)).fetchall()
+            else:
+                rows = conn.execute(sql_changes, (user_id, since)).fetchall()
+            version = conn.execute(SQL_REQUEST_VERSION).fetchone()[0]
+        return [_match_request_from_row(row) for row in rows], version
+
+    def list_requests_for_mentor(self, mentor_id, since=None):
+        return self._list_requests(mentor_id, since, SQL_REQUESTS_FOR_MENTOR, SQL_REQUEST_CHANGES_FOR_MENTOR)
+
+    def list_requests_for_mentee(self, mentee_id, since=None):
+        return self._list_requests(mentee_id, since, SQL_REQUESTS_FOR_MENTEE, SQL_REQUEST_CHANGES_FOR_MENTEE)
+
+    def get_request_version(self):
+        with self._connection() as conn:
+            return conn.execute(SQL_REQUEST_VERSION).fetchone()[0]
+
+    def list_request_changes(self, since):
+        # 쓰기 트랜잭션이 직렬화되어 version 순서대로 커밋되므로 since 이후 변경을 빠짐없이 읽음
+        with self._connection() as conn:
+            return [_match_request_from_row(row) for row in conn.execute(SQL_REQUEST_CHANGES, (since,))]
+
+    def set_request_status(self, request_id, status):
+        with self._transaction() as conn:
+            return self._set_request_status(conn, request_id, status)
+
+    def _set_request_status(self, conn, request_id, status):
+        conn.execute(SQL_SET_REQUEST_STATUS, (status, request_id, status))
+        return _match_request_from_row(conn.execute(SQL_MATCH_REQUEST, (request_id,)).fetchone())
+
+    def accept_match_request(self, request_id):
+        # BEGIN IMMEDIATE 가 다른 워커 프로세스의 수락과 직렬화하고,
+        # 대기 상태 조건부 UPDATE 로 먼저 처리된 요청은 건너뜀
+        with self._transaction() as conn:
+            return self._accept_match_request(conn, request_id)
+
+    def _accept_match_request(self, conn, request_id):
+        if conn.execute(SQL_ACCEPT_PENDING_REQUEST, (request_id,)).rowcount == 0:
+            return None
+        match_request = _match_request_from_row(conn.execute(SQL_MATCH_REQUEST, (request_id,)).fetchone())
+        rejected = conn.execute(SQL_REJECT_OTHER_PENDING, (match_request["mentorId"], request_id)).fetchall()
+        return [match_request] + sorted((_match_request_from_row(row) for row in rejected), key=lambda r: r["id"])
+
+    def apply_request_status_changes(self, changes):
+        with self._transaction() as conn:
+            return [
+                self._accept_match_request(conn, request_id) if status == "accepted"
+                else [self._set_request_status(conn, request_id, status)]
+                for request_id, status in changes
+            ]
+
+    # 토큰 폐기 목록
+    def revoke_token(self, jti, expires_at):
+        with self._transaction() as conn:
+            conn.execute(SQL_PRUNE_REVOKED_TOKENS, (time.time(),))
+            conn.execute(SQL_REVOKE_TOKEN, (jti, expires_at))
+
+    def is_token_revoked(self, jti):
+        with self._connection() as conn:
+            return conn.execute(SQL_IS_TOKEN_REVOKED, (jti,)).fetchone() is not None
+
+    def consume_token(self, jti, expires_at):
+        # INSERT OR IGNORE 가 행을 넣었을 때만 처음 사용 (다른 스레드/프로세스와 경쟁해도 한 번만 True)
+        with self._transaction() as conn:
+            conn.execute(SQL_PRUNE_REVOKED_TOKENS, (time.time(),))
+            return conn.execute(SQL_REVOKE_TOKEN, (jti, expires_at)).rowcount == 1
+
+    # 리프레시 토큰
+    def save_refresh_token(self, token_hash, family_id, user_id, expires_at):
+        with self._transaction() as conn:
+            conn.execute(SQL_PRUNE_REFRESH_TOKENS, (time.time(),))
+            conn.execute(SQL_INSERT_REFRESH_TOKEN, (token_hash, family_id, user_id, expires_at))
+
+    def rotate_refresh_token(self, token_hash, new_token_hash, expires_at):
+        # BEGIN IMMEDIATE 로 같은 토큰을 동시에 두 번 교환하는 경우를 직렬화
+        with self._transaction() as conn:
+            row = conn.execute(SQL_REFRESH_TOKEN, (token_hash,)).fetchone()
+            if row is None:
+                return None
+            family_id, user_id, token_expires_at, used = row
+            if token_expires_at <= time.time():
+                return None
+            if used:
+                conn.execute(SQL_DELETE_REFRESH_TOKEN_FAMILY, (token_hash,))
+                return None
+            conn.execute(SQL_MARK_REFRESH_TOKEN_USED, (token_hash,))
+            conn.execute(SQL_INSERT_REFRESH_TOKEN, (new_token_hash, family_id, user_id, expires_at))
+        return user_id
+
+    def revoke_refresh_token(self, token_hash):
+        with self._transaction() as conn:
+            conn.execute(SQL_DELETE_REFRESH_TOKEN_FAMILY, (token_hash,))
+
+
+    # 대량 적재
+    def bulk_load(self, users, match_requests=(), images=(), image_url=None):
+        check_bulk_positions(len(users), match_requests, images)
+        # 한 트랜잭션 + executemany 로 적재 (건별 커밋/문장 준비 비용 없음)
+        try:
+            with self._transaction() as conn:
+                first_id = conn.execute(SQL_MAX_USER_ID).fetchone()[0] + 1
+                user_ids = list(range(first_id, first_id + len(users)))
+                if image_url:
+                    for user_index, _ in images:
+                        _, _, _, role, profile = users[user_index]
+                        profile["imageUrl"] = image_url.format(role=role, id=user_ids[user_index])
+                conn.executemany(SQL_INSERT_USER_WITH_ID, (
+                    (user_id, email, normalize_email(email), password_hash, name, role)
+                    for user_id, (email, password_hash, name, role, _) in zip(user_ids, users)
+                ))
+                conn.executemany(SQL_UPSERT_PROFILE, (
+                    (
+                        user_id, profile["name"], profile["bio"], profile["imageUrl"],
+                        json.dumps(profile["skills"], ensure_ascii=False)
+                        if profile.get("skills") is not None else None,
+                        skill_sort_key(profile),
+                    )
+                    for user_id, (_, _, _, _, profile) in zip(user_ids, users)
+                ))
+                conn.executemany(SQL_INSERT_SKILL, (
+                    (skill.lower(), user_id)
+                    for user_id, (_, _, _, role, profile) in zip(user_ids, users) if role == "mentor"
+                    for skill in profile.get("skills") or []
+                ))
+
+                first_version = conn.execute(SQL_REQUEST_VERSION).fetchone()[0] + 1
+                conn.executemany(SQL_INSERT_MATCH_REQUEST_WITH_VERSION, (
+                    (user_ids[mentor_index], user_ids[mentee_index], message, status, first_version + i)
+                    for i, (mentor_index, mentee_index, message, status) in enumerate(match_requests)
+                ))
+
+                now = time.time()
+                for user_index, variants in images:
+                    for name, image in variants.items():
+                        conn.execute(SQL_INSERT_IMAGE_BLOB, (image["digest"], image["media_type"], image["data"]))
+                        conn.execute(SQL_INSERT_USER_IMAGE, (user_ids[user_index], name, image["digest"], now))
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Bulk load conflicts with existing data: {e}")
+        return user_ids
+
+
+def create_repository(backend: str = STORAGE_BACKEND) -> Repository:
+    """환경변수 설정에 맞는 저장소 생성"""
+    if backend == "memory":
+        return InMemoryRepository()
+    if backend == "sqlite":
+        return SQLiteRepository()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+class AsyncRepository:
+    """Repository 메서드를 await 로 호출하는 래퍼
+
+    SQLite 는 BEGIN IMMEDIATE 잠금 대기 (최대 SQLITE_BUSY_TIMEOUT_MS) 와 디스크 I/O 가
+    있으므로 커넥션 풀 크기만큼의 전용 스레드에서 실행한다. 스레드 수와 커넥션 수가
+    같아서 풀에서 커넥션을 기다리는 일은 없다.
+    메모리 저장소는 스레드 안전하지 않고 호출이 짧으므로 이벤트 루프에서 바로 실행한다.
+    동기 API 가 필요하면 (시드 / 벤치마크 스크립트) .sync 를 사용한다.
+    """
+
+    def __init__(self, repo: Repository):
+        self.sync = repo
+        self._executor = None
+        if isinstance(repo, SQLiteRepository):
+            self._executor = ThreadPoolExecutor(max_workers=repo.pool_size, thread_name_prefix="sqlite")
+
+    def __getattr__(self, name):
+        method = getattr(self.sync, name)
+        executor = self._executor
+        if executor is None:
+            async def call(*args, **kwargs):
+                return method(*args, **kwargs)
+        else:
+            async def call(*args, **kwargs):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(executor, functools.partial(method, *args, **kwargs))
+        # 다음 호출부터는 __getattr__ 을 거치지 않음
+        setattr(self, name, call)
+        return call
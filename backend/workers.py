@@ -0,0 +1,34 @@
+"""
+CPU 작업용 워커 풀 - 이벤트 루프를 막지 않도록 스레드에서 실행
+"""
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+import asyncio
+import threading
+
+
+class BoundedWorkerPool:
+    """스레드 풀 + 대기열 상한
+
+    실행 중 + 대기 중인 작업이 workers + queue_limit 개를 넘으면
+    Retry-After 헤더와 함께 503 을 반환한다.
+    """
+
+    def __init__(self, name: str, workers: int, queue_limit: int, retry_after_seconds: int):
+        self.name = name
+        self.retry_after_seconds = retry_after_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    async def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry later",
+                headers={"Retry-After": str(self.retry_after_seconds)},
+            )
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._slots.release()
@@ -0,0 +1,51 @@
+// 매칭 요청 변경 이벤트 (Server-Sent Events) 구독
+// EventSource 는 헤더를 붙일 수 없으므로 연결할 때마다 1회용 티켓을 받아
+// 쿼리 파라미터로 전달한다 (액세스 토큰이 URL/접근 로그에 남지 않음).
+// 연결이 끊기면 새 티켓으로 다시 연결한다.
+import axios from 'axios'
+
+const EVENTS_URL = 'http://localhost:8080/api/match-requests/events'
+const TICKET_URL = `${EVENTS_URL}/ticket`
+const RECONNECT_DELAY_MS = 3000
+
+export function subscribeMatchRequestEvents(onEvent) {
+  let source = null
+  let timer = null
+  let closed = false
+
+  const reconnectLater = () => {
+    if (!closed) timer = setTimeout(connect, RECONNECT_DELAY_MS)
+  }
+
+  const connect = async () => {
+    const token = localStorage.getItem('token')
+    if (closed || !token) return
+    let ticket
+    try {
+      const response = await axios.post(TICKET_URL, null, {
+        headers: { Authorization: `Bearer ${token}` }
+      })
+      ticket = response.data.ticket
+    } catch (error) {
+      reconnectLater()
+      return
+    }
+    if (closed) return
+    source = new EventSource(`${EVENTS_URL}?ticket=${encodeURIComponent(ticket)}`)
+    source.addEventListener('match-request', event => {
+      onEvent(JSON.parse(event.data))
+    })
+    source.onerror = () => {
+      source.close()
+      reconnectLater()
+    }
+  }
+
+  connect()
+
+  return () => {
+    closed = true
+    clearTimeout(timer)
+    if (source) source.close()
+  }
+}
@@ -1,5 +1,6 @@
 import { createApp } from 'vue'
 import { createRouter, createWebHistory } from 'vue-router'
+import axios from 'axios'
 import App from './App.vue'
 import Login from './components/Login.vue'
 import Signup from './components/Signup.vue'
@@ -34,6 +35,54 @@ router.beforeEach((to, from, next) => {
   }
 })
 
+// 액세스 토큰 만료(401) 시 리프레시 토큰으로 재발급 후 요청 재시도
+// 동시에 여러 요청이 401 을 받아도 재발급은 한 번만 수행
+const REFRESH_URL = 'http://localhost:8080/api/token/refresh'
+let refreshPromise = null
+
+function refreshAccessToken() {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('refreshToken')
+    refreshPromise = axios.post(REFRESH_URL, { refreshToken })
+      .then(response => {
+        localStorage.setItem('token', response.data.token)
+        localStorage.setItem('refreshToken', response.data.refreshToken)
+        return response.data.token
+      })
+      .catch(error => {
+        localStorage.removeItem('token')
+        localStorage.removeItem('refreshToken')
+        router.push('/login')
+        throw error
+      })
+      .finally(() => {
+        refreshPromise = null
+      })
+  }
+  return refreshPromise
+}
+
+axios.interceptors.response.use(
+  response => response,
+  async error => {
+    const config = error.config
+    if (
+      error.response?.status === 401 &&
+      config &&
+      !config._retried &&
+      config.url !== REFRESH_URL &&
+      config.headers?.Authorization &&
+      localStorage.getItem('refreshToken')
+    ) {
+      config._retried = true
+      const token = await refreshAccessToken()
+      config.headers.Authorization = `Bearer ${token}`
+      return axios(config)
+    }
+    return Promise.reject(error)
+  }
+)
+
 const app = createApp(App)
 app.use(router)
 app.mount('#app')